@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for raw chapter text
+
+Blobs hold the normalized text and are keyed by its SHA-256, so the same chapter
+body fetched twice (re-runs, or ttkan/xbanxia mirrors of one novel) is stored once
+and recognized by key alone. Chapter manifest records point at blobs; reference
+counts live in refs.json, and gc() removes blobs no novel manifest points to (run
+it while no crawler is writing to the store).
+
+Usage:
+    python blob_store.py gc      # delete blobs no chapter points to
+    python blob_store.py stats   # blob count, size and references
+"""
+
+import os
+import sys
+import json
+import zlib
+import hashlib
+import tempfile
+import threading
+import unicodedata
+
+
+DEFAULT_ROOT = os.path.join('novels', '_blobs')
+
+
+def normalize_text(text):
+    """Normalize chapter text for hashing: NFC, trimmed lines, no blank lines"""
+    text = unicodedata.normalize('NFC', text or '')
+    lines = (line.strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def blob_key(text):
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class BlobStore:
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.refs_path = os.path.join(root, 'refs.json')
+        self._lock = threading.RLock()
+        self._refs_dirty = False
+        self.refs = {}
+        if os.path.exists(self.refs_path):
+            with open(self.refs_path, 'r', encoding='utf-8') as f:
+                self.refs = json.load(f)
+
+    def _blob_path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def has(self, key):
+        return os.path.exists(self._blob_path(key))
+
+    def put(self, text):
+        """Store normalized text (no-op if the same content is already stored) and return its key"""
+        text = normalize_text(text)
+        key = blob_key(text)
+        path = self._blob_path(key)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp_')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(text.encode('utf-8'), 6))
+            os.replace(tmp_path, path)
+        return key
+
+    def get(self, key):
+        """Return the normalized text for a key, or None if the blob is missing"""
+        path = self._blob_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            # Blobs written before put() normalized hold whichever copy arrived first
+            return normalize_text(zlib.decompress(f.read()).decode('utf-8'))
+
+    def incref(self, key):
+        with self._lock:
+            self.refs[key] = self.refs.get(key, 0) + 1
+            self._refs_dirty = True
+            return self.refs[key]
+
+    def decref(self, key):
+        with self._lock:
+            self.refs[key] = max(0, self.refs.get(key, 0) - 1)
+            self._refs_dirty = True
+            return self.refs[key]
+
+    def flush(self):
+        """Persist reference counts atomically"""
+        with self._lock:
+            if not self._refs_dirty:
+                return
+            os.makedirs(self.root, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.tmp_', suffix='.json')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.refs, f)
+            os.replace(tmp_path, self.refs_path)
+            self._refs_dirty = False
+
+    def _iter_blobs(self):
+        if not os.path.isdir(self.root):
+            return
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if len(prefix) != 2 or not os.path.isdir(prefix_dir):
+                continue
+            for key in os.listdir(prefix_dir):
+                if not key.startswith('.tmp_'):
+                    yield key, os.path.join(prefix_dir, key)
+
+    def manifest_refs(self):
+        """Count the chapter manifest entries pointing at each blob (manifests live next to the store)"""
+        refs = {}
+        novels_root = os.path.dirname(os.path.abspath(self.root))
+        for name in os.listdir(novels_root):
+            manifest_path = os.path.join(novels_root, name, 'manifest.json')
+            if not os.path.isfile(manifest_path):
+                continue
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            for chapter in manifest.get('chapters', {}).values():
+                for entry in chapter.values():
+                    if entry.get('storage') == 'blob' and entry.get('blob'):
+                        refs[entry['blob']] = refs.get(entry['blob'], 0) + 1
+        return refs
+
+    def gc(self):
+        """
+        Delete blobs no manifest points to; returns (blobs removed, bytes freed).
+        refs.json is written separately from the manifests and may lag behind them,
+        so the manifests decide what is live and the counts are rebuilt from them.
+        """
+        removed = 0
+        freed = 0
+        with self._lock:
+            live = self.manifest_refs()
+            for key, path in list(self._iter_blobs()):
+                if key not in live:
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+                    removed += 1
+            self.refs = live
+            self._refs_dirty = True
+            self.flush()
+        return removed, freed
+
+    def stats(self):
+        blobs = list(self._iter_blobs())
+        return {
+            'blobs': len(blobs),
+            'bytes': sum(os.path.getsize(path) for _, path in blobs),
+            'references': sum(self.refs.values()),
+            'shared': sum(1 for count in self.refs.values() if count > 1)
+        }
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('gc', 'stats'):
+        print("Usage: python blob_store.py <gc|stats> [blob_root]")
+        sys.exit(1)
+
+    store = BlobStore(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_ROOT)
+    if sys.argv[1] == 'gc':
+        removed, freed = store.gc()
+        print(f"Removed {removed} unreferenced blobs ({freed} bytes)")
+    else:
+        print(json.dumps(store.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Cross-chapter boilerplate detection
+
+Counts, per novel, in how many chapters each normalized paragraph appears. Lines
+repeated across many chapters (site notices, author footers, "please bookmark"
+ads) are either stripped or translated once and served from the translation
+memory, instead of being paid for in every chapter.
+"""
+
+import re
+import hashlib
+import unicodedata
+
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_paragraph(text):
+    """NFKC, no whitespace, lowercase: the same notice with different spacing/width matches"""
+    return WHITESPACE_RE.sub('', unicodedata.normalize('NFKC', text or '')).lower()
+
+
+def paragraph_key(text):
+    return hashlib.sha1(normalize_paragraph(text).encode('utf-8')).hexdigest()[:16]
+
+
+class BoilerplateIndex:
+    def __init__(self, min_chapters=5, max_length=300, max_entries=100000):
+        self.min_chapters = min_chapters
+        self.max_length = max_length  # Longer paragraphs are story text, never tracked
+        self.max_entries = max_entries
+        self.counts = {}
+        self.chapters = set()
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        index = cls(**kwargs)
+        if data:
+            index.counts = dict(data.get('counts', {}))
+            index.chapters = set(data.get('chapters', []))
+        return index
+
+    def to_dict(self):
+        return {'counts': dict(self.counts), 'chapters': sorted(self.chapters)}
+
+    def add_chapter(self, chapter_key, content):
+        """Count each distinct short paragraph of a chapter once (once per chapter key)"""
+        chapter_key = str(chapter_key)
+        if chapter_key in self.chapters:
+            return
+        self.chapters.add(chapter_key)
+
+        keys = {paragraph_key(p) for p in (content or '').split('\n\n') if p.strip() and len(p) <= self.max_length}
+        for key in keys:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+        if len(self.counts) > self.max_entries:
+            self.counts = {key: count for key, count in self.counts.items() if count > 1}
+
+    def is_boilerplate(self, paragraph):
+        if not paragraph.strip() or len(paragraph) > self.max_length:
+            return False
+        return self.counts.get(paragraph_key(paragraph), 0) >= self.min_chapters
+
+    def split(self, content):
+        """
+        Split chapter text into (leading, body, trailing): the runs of boilerplate
+        paragraphs at the start and end of the chapter, and the text in between.
+        The body is never filtered: short lines repeated across chapters inside the
+        story (「好。」, 「嗯。」) are dialogue, not site notices.
+        """
+        paragraphs = [p for p in (content or '').split('\n\n') if p.strip()]
+        start = 0
+        while start < len(paragraphs) and self.is_boilerplate(paragraphs[start]):
+            start += 1
+        end = len(paragraphs)
+        while end > start and self.is_boilerplate(paragraphs[end - 1]):
+            end -= 1
+
+        return paragraphs[:start], '\n\n'.join(paragraphs[start:end]), paragraphs[end:]
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Per-novel compressed chapter archive (alternative to loose chapters_raw/chapters_translated HTML files)
+
+Layout inside novels/novel_<id>/:
+    chapters.pack      append-only sequence of compressed frames
+    chapters.idx.json  offset index: kind -> chapter number -> frame location
+
+Every frame is self-describing (magic, header length, payload length, JSON header,
+compressed payload), so the index can always be rebuilt by scanning the pack.
+
+Usage:
+    python chapter_archive.py import novels/novel_123   # pack existing HTML files
+    python chapter_archive.py export novels/novel_123   # write HTML files back out
+    python chapter_archive.py compact novels/novel_123  # drop superseded frames
+"""
+
+import os
+import re
+import sys
+import json
+import zlib
+import struct
+import tempfile
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+PACK_FILE = 'chapters.pack'
+INDEX_FILE = 'chapters.idx.json'
+MANIFEST_FILE = 'manifest.json'  # Per-novel chapter manifest written by FileManager
+FRAME_MAGIC = b'CHF1'
+FRAME_HEADER = struct.Struct('>4sII')  # magic, header length, payload length
+KIND_DIRS = {'raw': 'chapters_raw', 'translated': 'chapters_translated'}
+CHAPTER_FILE_RE = re.compile(r'(?:_Chapter_|^chapter_)(\d+)\.html$', re.IGNORECASE)
+
+
+def _compress(data):
+    """Compress bytes with zstd when available, zlib otherwise"""
+    if zstandard:
+        return 'zstd', zstandard.ZstdCompressor(level=6).compress(data)
+    return 'zlib', zlib.compress(data, 6)
+
+
+def _decompress(codec, data):
+    if codec == 'zstd':
+        if not zstandard:
+            raise RuntimeError("Archive frame is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+
+class ChapterArchive:
+    def __init__(self, novel_dir):
+        self.novel_dir = novel_dir
+        self.pack_path = os.path.join(novel_dir, PACK_FILE)
+        self.index_path = os.path.join(novel_dir, INDEX_FILE)
+        self._lock = threading.RLock()
+        self._index_dirty = False
+        self.index = self._load_index()
+
+    def _load_index(self):
+        """Load the offset index, scanning any frames appended after it was written"""
+        index = {'end': 0, 'chapters': {kind: {} for kind in KIND_DIRS}}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except (ValueError, OSError):
+                pass  # Corrupt index - rebuilt from the pack below
+
+        pack_size = os.path.getsize(self.pack_path) if os.path.exists(self.pack_path) else 0
+        if index.get('end', 0) > pack_size:
+            # Index points past the pack (pack replaced/truncated) - rebuild from scratch
+            index = {'end': 0, 'chapters': {kind: {} for kind in KIND_DIRS}}
+        if index['end'] < pack_size:
+            self._scan_frames(index, pack_size)
+            self._index_dirty = True
+        return index
+
+    def _scan_frames(self, index, pack_size):
+        """Index frames from index['end'] to the end of the pack; a torn final frame is ignored"""
+        with open(self.pack_path, 'rb') as f:
+            offset = index['end']
+            while offset + FRAME_HEADER.size <= pack_size:
+                f.seek(offset)
+                magic, header_len, payload_len = FRAME_HEADER.unpack(f.read(FRAME_HEADER.size))
+                frame_end = offset + FRAME_HEADER.size + header_len + payload_len
+                if magic != FRAME_MAGIC or frame_end > pack_size:
+                    break
+                header = json.loads(f.read(header_len).decode('utf-8'))
+                header['offset'] = offset + FRAME_HEADER.size + header_len
+                header['length'] = payload_len
+                kind = header.pop('kind')
+                number = str(header.pop('chapter'))
+                index['chapters'].setdefault(kind, {})[number] = header
+                offset = frame_end
+            index['end'] = offset
+
+    def put(self, kind, chapter_number, text, filename=None):
+        """Append a chapter frame (superseding any earlier frame for the same chapter)"""
+        codec, payload = _compress(text.encode('utf-8'))
+        header = {'kind': kind, 'chapter': int(chapter_number), 'codec': codec, 'name': filename}
+        header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+
+        with self._lock:
+            os.makedirs(self.novel_dir, exist_ok=True)
+            with open(self.pack_path, 'ab') as f:
+                # Start after whatever is on disk (drops a torn frame from a crash)
+                f.truncate(self.index['end'])
+                f.seek(self.index['end'])
+                f.write(FRAME_HEADER.pack(FRAME_MAGIC, len(header_bytes), len(payload)))
+                f.write(header_bytes)
+                f.write(payload)
+
+            payload_offset = self.index['end'] + FRAME_HEADER.size + len(header_bytes)
+            self.index['chapters'].setdefault(kind, {})[str(int(chapter_number))] = {
+                'codec': codec,
+                'name': filename,
+                'offset': payload_offset,
+                'length': len(payload)
+            }
+            self.index['end'] = payload_offset + len(payload)
+            self._index_dirty = True
+
+    def get(self, kind, chapter_number):
+        """Read one chapter by number (single seek + read), or None if not stored"""
+        entry = self.index['chapters'].get(kind, {}).get(str(int(chapter_number)))
+        if not entry:
+            return None
+        with open(self.pack_path, 'rb') as f:
+            f.seek(entry['offset'])
+            return _decompress(entry['codec'], f.read(entry['length'])).decode('utf-8')
+
+    def has(self, kind, chapter_number):
+        return str(int(chapter_number)) in self.index['chapters'].get(kind, {})
+
+    def chapter_numbers(self, kind):
+        return sorted(int(number) for number in self.index['chapters'].get(kind, {}))
+
+    def flush(self):
+        """Persist the offset index atomically"""
+        with self._lock:
+            if not self._index_dirty:
+                return
+            fd, tmp_path = tempfile.mkstemp(dir=self.novel_dir, prefix='.tmp_', suffix='.json')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+            self._index_dirty = False
+
+    def compact(self):
+        """Rewrite the pack keeping only the latest frame of every chapter"""
+        with self._lock:
+            old_index = self.index
+            old_pack = self.pack_path + '.old'
+            if not os.path.exists(self.pack_path):
+                return
+            os.replace(self.pack_path, old_pack)
+            self.index = {'end': 0, 'chapters': {kind: {} for kind in KIND_DIRS}}
+            with open(old_pack, 'rb') as f:
+                for kind, entries in old_index['chapters'].items():
+                    for number in sorted(entries, key=int):
+                        entry = entries[number]
+                        f.seek(entry['offset'])
+                        text = _decompress(entry['codec'], f.read(entry['length'])).decode('utf-8')
+                        self.put(kind, number, text, entry.get('name'))
+            self._index_dirty = True
+            self.flush()
+            os.remove(old_pack)
+
+    def import_directory(self):
+        """Pack the loose chapters_raw / chapters_translated HTML files of this novel"""
+        imported = 0
+        for kind, dirname in KIND_DIRS.items():
+            chapters_dir = os.path.join(self.novel_dir, dirname)
+            if not os.path.isdir(chapters_dir):
+                continue
+            for filename in sorted(os.listdir(chapters_dir)):
+                match = CHAPTER_FILE_RE.search(filename)
+                if not match:
+                    continue
+                with open(os.path.join(chapters_dir, filename), 'r', encoding='utf-8') as f:
+                    self.put(kind, int(match.group(1)), f.read(), filename)
+                imported += 1
+        self.flush()
+        self.update_manifest('archive')
+        return imported
+
+    def export_directory(self):
+        """Write every archived chapter back out in the loose-file layout"""
+        exported = 0
+        for kind, dirname in KIND_DIRS.items():
+            chapters_dir = os.path.join(self.novel_dir, dirname)
+            for number in self.chapter_numbers(kind):
+                entry = self.index['chapters'][kind][str(number)]
+                filename = entry.get('name') or f"chapter_{number:03d}.html"
+                os.makedirs(chapters_dir, exist_ok=True)
+                with open(os.path.join(chapters_dir, filename), 'w', encoding='utf-8') as f:
+                    f.write(self.get(kind, number))
+                exported += 1
+        self.update_manifest('files')
+        return exported
+
+    def update_manifest(self, storage):
+        """
+        Point the manifest entries of archived chapters at `storage` ('archive' after an
+        import, 'files' after an export), so lookups keep working once the other copy
+        is deleted. Blob-stored raw chapters are left alone.
+        """
+        manifest_path = os.path.join(self.novel_dir, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return 0  # Rebuilt from the files / archive on first use
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        updated = 0
+        for number, entry in manifest.get('chapters', {}).items():
+            for kind, record in entry.items():
+                if record.get('storage') in ('blob', storage) or not self.has(kind, number):
+                    continue
+                record['storage'] = storage
+                if storage == 'files':
+                    record['filename'] = self.index['chapters'][kind][str(int(number))].get('name') or f"chapter_{int(number):03d}.html"
+                updated += 1
+
+        if updated:
+            fd, tmp_path = tempfile.mkstemp(dir=self.novel_dir, prefix='.tmp_', suffix='.json')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, manifest_path)
+        return updated
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('import', 'export', 'compact'):
+        print("Usage: python chapter_archive.py <import|export|compact> <novel_dir>")
+        print("\nExample:")
+        print("  python chapter_archive.py import novels/novel_396508")
+        sys.exit(1)
+
+    command, novel_dir = sys.argv[1], sys.argv[2]
+    archive = ChapterArchive(novel_dir)
+
+    if command == 'import':
+        print(f"Imported {archive.import_directory()} chapters into {archive.pack_path}")
+    elif command == 'export':
+        print(f"Exported {archive.export_directory()} chapters from {archive.pack_path}")
+    else:
+        archive.compact()
+        print(f"Compacted {archive.pack_path} ({os.path.getsize(archive.pack_path)} bytes)")
+
+
+if __name__ == '__main__':
+    main()
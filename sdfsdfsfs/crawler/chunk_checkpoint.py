@@ -0,0 +1,43 @@
+"""
+Crash-safe checkpoints of partially translated chapters
+
+Translated chunks of a chapter are written to disk as soon as they complete,
+keyed by chunk index and the hash of the chunk's source text. A run that dies
+mid-chapter (runner timeout, cancelled job) resumes by translating only the
+chunks that are missing. The checkpoint is dropped once the chapter is saved.
+"""
+
+import hashlib
+import threading
+
+
+class ChunkCheckpoint:
+    def __init__(self, file_manager, novel_id, chapter_number, source_hash):
+        self.file_manager = file_manager
+        self.novel_id = novel_id
+        self.chapter_number = chapter_number
+        self.source_hash = source_hash
+        self.chunks = file_manager.load_chunk_checkpoint(novel_id, chapter_number, source_hash)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(index, text):
+        return f"{index}:{hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]}"
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def get(self, index, text):
+        """Translated paragraphs of chunk `index` with source `text`, or None"""
+        return self.chunks.get(self.key(index, text))
+
+    def put(self, index, text, paragraphs):
+        """Store a translated chunk and write the checkpoint immediately"""
+        with self._lock:
+            self.chunks[self.key(index, text)] = list(paragraphs)
+            self.file_manager.save_chunk_checkpoint(self.novel_id, self.chapter_number, self.source_hash, self.chunks)
+
+    def clear(self):
+        with self._lock:
+            self.chunks = {}
+            self.file_manager.clear_chunk_checkpoint(self.novel_id, self.chapter_number)
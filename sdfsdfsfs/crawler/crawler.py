@@ -8,12 +8,18 @@ import sys
 import os
 import json
 import time
-import requests
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from epub_parser import EpubParser
 from translator import Translator
 from parser import NovelParser
 from wordpress_api import WordPressAPI
 from file_manager import FileManager
+from download_manager import DownloadManager
+from term_miner import TermMiner
+from boilerplate import BoilerplateIndex
+from chunk_checkpoint import ChunkCheckpoint
 from config_loader import load_config
 
 
@@ -34,6 +40,9 @@ class NovelCrawler:
         self.delay = self.config.get('delay_between_requests', 2)
         self.should_translate = self.config.get('translate', False)
         self.target_language = self.config.get('target_language', 'en')
+        self.update_scan_workers = self.config.get('update_scan_workers', 8)
+        self.boilerplate_mode = self.config.get('boilerplate_mode', 'cache')  # 'cache', 'strip' or 'off'
+        self._boilerplate_indexes = {}
         
         # Initialize modules
         self.translator = None
@@ -48,9 +57,10 @@ class NovelCrawler:
                 self.log("Please check if googletrans==4.0.0rc1 is installed: pip install googletrans==4.0.0rc1")
                 raise Exception("Translation service initialization failed")
         
-        self.parser = NovelParser(self.log)
+        self.parser = NovelParser(self.log, self.config)
         self.wordpress = WordPressAPI(self.wordpress_url, self.api_key, self.log)
-        self.file_manager = FileManager(self.log)
+        self.file_manager = FileManager(self.log, self.config)
+        self.downloads = DownloadManager(self.log)
         
         # OPTIMIZATION: Batch configuration
         self.bulk_chapter_size = 1  # Chapter-by-chapter mode (requested by user)
@@ -61,6 +71,22 @@ class NovelCrawler:
         except UnicodeEncodeError:
             print(message.encode('ascii', 'replace').decode('ascii'), flush=flush)
     
+    def _translation_model(self, models_used=None):
+        """
+        Identifier of the model/backend producing translations (recorded in the manifest).
+        `models_used` is the set from Translator.track_models(): the models that actually
+        served the chapter, which differ from the preferred one after a failover.
+        """
+        if not self.should_translate or not self.translator:
+            return None
+        if self.translator.mock:
+            return 'mock'
+        if self.translator.service == 'openrouter':
+            if models_used:
+                return ','.join(sorted(models_used))
+            return self.translator.openrouter_model
+        return self.translator.service
+    
     def process_chapters_in_batches(self, chapters_data, story_id, novel_url, total_chapters, job_id=None):
         """
         Process chapters in batches for optimal performance
@@ -225,6 +251,16 @@ class NovelCrawler:
 
     def process_job(self, job_data):
         """Process a specific job"""
+        # Telemetry covers every translator call of the job, and its summary is logged however the job ends
+        if self.translator:
+            self.translator.telemetry.start_job(job_data.get('job_id') or job_data.get('url') or job_data.get('epub_url'))
+        try:
+            return self._process_job(job_data)
+        finally:
+            if self.translator:
+                self._log_translation_telemetry()
+    
+    def _process_job(self, job_data):
         # Extract job parameters
         novel_url = job_data.get('url')
         # Use config default if max_chapters is not provided in job_data
@@ -266,32 +302,26 @@ class NovelCrawler:
         # 1. Fetch novel info
         if job_type == 'epub':
             self.log("Downloading Epub...")
-            if not os.path.exists('temp'):
-                os.makedirs('temp')
-            
-            epub_filename = f"temp/job_{job_data.get('job_id', int(time.time()))}.epub"
             try:
-                response = requests.get(epub_url, stream=True)
-                response.raise_for_status()
-                with open(epub_filename, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+                # Cached by URL: retried jobs reuse the file, interrupted downloads resume
+                epub_filename = self.downloads.fetch(epub_url, suffix='.epub', validate=zipfile.is_zipfile)
                 self.log(f"Epub downloaded to {epub_filename}")
                 
+                # Mock novel_id
+                import hashlib
+                novel_id = hashlib.md5(epub_url.encode()).hexdigest()[:8]
+                novel_url = epub_url # Override for consistent usage downstream
+                
+                # Open the book once; chapter bodies are decoded lazily per batch
                 epub_parser = EpubParser(self.log)
-                novel_data = epub_parser.parse_novel_info(epub_filename)
-                chapters = epub_parser.extract_chapters(epub_filename)
-                novel_data['chapters'] = chapters
+                novel_data, chapters = epub_parser.open_book(epub_filename, cover_dir=self.file_manager.novel_dir(novel_id))
+                if not novel_data:
+                    raise Exception("Could not read EPUB file")
                 
                 # Defaults for fields not in epub
                 if 'type' not in novel_data: novel_data['type'] = 'epub'
                 if 'status' not in novel_data: novel_data['status'] = 'Completed'
                 
-                # Mock novel_id
-                import hashlib
-                novel_id = hashlib.md5(epub_url.encode()).hexdigest()[:8]
-                novel_url = epub_url # Override for consistent usage downstream
-                
             except Exception as e:
                 self.log(f"Failed to process epub: {e}")
                 raise e
@@ -341,7 +371,7 @@ class NovelCrawler:
                  if self.should_translate:
                      try:
                          # Check local cache first for consistency
-                         existing_metadata_path = os.path.join('novels', f'novel_{novel_id}', 'metadata.json')
+                         existing_metadata_path = os.path.join(self.file_manager.novel_dir(novel_id), 'metadata.json')
                          # ... existing cache logic ...
                          if os.path.exists(existing_metadata_path):
                             with open(existing_metadata_path, 'r', encoding='utf-8') as f:
@@ -388,7 +418,7 @@ class NovelCrawler:
                 'author': novel_data['author'],
                 'url': novel_url,
                 'cover_url': novel_data['cover_url'],
-                'cover_path': None,
+                'cover_path': novel_data.get('cover_path'),
                 'genres': ai_metadata.get('genres', []),
                 'tags': ai_metadata.get('tags', [])
             }
@@ -442,31 +472,38 @@ class NovelCrawler:
         else:
             current_glossary = self.file_manager.load_glossary(novel_id)
         
+        # Recurring-term counts persist per novel, so extraction only runs when new names appear
+        term_miner = TermMiner.from_dict(
+            self.file_manager.load_term_stats(novel_id),
+            min_count=self.config.get('glossary_min_term_count', 3),
+            min_candidates=self.config.get('glossary_min_candidates', 3)
+        )
+        
         total_batches = (len(chapters_to_do) + batch_size - 1) // batch_size
         
-        for b_idx in range(total_batches):
-            # CHECK FOR CANCELLATION
-            if job_data.get('job_id'):
-                current_job_check = self.wordpress.get_job()
-                # ... (rest of cancellation code)
-                if not current_job_check or current_job_check.get('job_id') != job_data.get('job_id'):
-                     self.log(f"    ⚠ Job cancelled or removed. Stopping...")
-                     return # Exit cleanly
-
+        def prepare_batch(b_idx, glossary):
+            """Fetch the raw chapters of a batch and extend the glossary with them"""
             batch = chapters_to_do[b_idx * batch_size : (b_idx + 1) * batch_size]
-            self.log(f"Processing batch {b_idx + 1}/{total_batches} ({len(batch)} chapters) [Glossary Context Mode]")
+            glossary = list(glossary)  # extract_glossary appends in place; keep earlier versions intact
             
             # Fetch Raw Content
             raw_contents = [] 
             batch_text_context = ""
             
             for chap_num, chap_info in batch:
+                if stopped.is_set():
+                    return raw_contents, glossary  # The job has ended
                 if job_type == 'epub':
-                     title = chap_info.get('title')
-                     content = chap_info.get('content')
+                     title, content = epub_parser.load_chapter(chap_info, chap_num)
                 else:
-                    title, content = self.parser.parse_chapter_page(chap_info['url'])
-                    time.sleep(1) 
+                    cached_raw = self.file_manager.get_cached_chapter(novel_id, chap_num, is_translated=False)
+                    if cached_raw:
+                        title, content = cached_raw
+                    else:
+                        title, content = self.parser.parse_chapter_page(chap_info['url'])
+                        if title and content and not stopped.is_set():
+                            self.file_manager.save_chapter(novel_id, chap_num, title, content, novel_data['title'], is_translated=False)
+                        time.sleep(1) 
                 
                 if title and content:
                     content_len = len(content)
@@ -483,43 +520,130 @@ class NovelCrawler:
                 else:
                     self.log(f"    ⚠ Skipped Chapter {chap_num}: Unable to extract content")
             
-            # Glossary Extraction
+            # Glossary Extraction (gated by local candidate-term mining)
             if glossary_mode and self.should_translate and self.translator:
-                self.log("Generating/Updating glossary...")
+                for item in raw_contents:
+                    term_miner.add_chapter(item['num'], f"{item['title']}\n{item['content']}")
+                candidates = term_miner.new_candidates(glossary)
+                extracted = False
                 try:
-                    # Pass limited context to avoid token limits
-                    current_glossary = self.translator.extract_glossary(batch_text_context[:10000], current_glossary)
-                    self.file_manager.save_glossary(novel_id, current_glossary)
+                    if stopped.is_set():
+                        return raw_contents, glossary
+                    if not term_miner.cjk_chars:
+                        # Non-CJK source: n-gram mining does not apply, extract from the whole batch
+                        self.log("Generating/Updating glossary...")
+                        glossary = self.translator.extract_glossary(batch_text_context[:10000], glossary)
+                        extracted = True
+                    elif term_miner.should_extract(candidates):
+                        self.log(f"Generating/Updating glossary ({len(candidates)} new candidate terms)...")
+                        context = term_miner.context_for(batch_text_context, candidates)
+                        glossary = self.translator.extract_glossary(context, glossary)
+                        term_miner.mark_submitted(candidates)
+                        extracted = True
+                    else:
+                        self.log(f"  Glossary up to date ({len(candidates)} new candidate terms) - skipping extraction")
+                    if stopped.is_set():
+                        return raw_contents, glossary  # Ended during extraction: persist nothing
+                    if extracted:
+                        self.file_manager.save_glossary(novel_id, glossary)
+                    self.file_manager.save_term_stats(novel_id, term_miner.to_dict())
                 except Exception as e:
                     raise Exception(f"Glossary extraction failed (Required): {e}")
-
-            # Translate & Upload
-            prepared_chapters = []
-            for item in raw_contents:
+            
+            return raw_contents, glossary
+        
+        # Lookahead: batch N+1 is fetched and its glossary extracted in the background while
+        # batch N is translated. Each batch is translated with the glossary version produced by
+        # its own preparation, so the result is the same as running the stages in sequence.
+        # `stopped` makes a preparation still running when the job ends stop fetching and
+        # persist nothing, so it cannot touch the novel's state after (or during) the next job.
+        stopped = threading.Event()
+        prepare_executor = ThreadPoolExecutor(max_workers=1)
+        next_batch = prepare_executor.submit(prepare_batch, 0, current_glossary) if total_batches else None
+        try:
+            for b_idx in range(total_batches):
+                # CHECK FOR CANCELLATION
+                if job_data.get('job_id'):
+                    current_job_check = self.wordpress.get_job()
+                    # ... (rest of cancellation code)
+                    if not current_job_check or current_job_check.get('job_id') != job_data.get('job_id'):
+                         self.log(f"    ⚠ Job cancelled or removed. Stopping...")
+                         return # Exit cleanly
+                
+                self.log(f"Processing batch {b_idx + 1}/{total_batches} [Glossary Context Mode]")
+                raw_contents, current_glossary = next_batch.result()
+                if b_idx + 1 < total_batches:
+                    next_batch = prepare_executor.submit(prepare_batch, b_idx + 1, current_glossary)
+                
+                # Translate the batch's chapter titles in bulk. They are the titles as loaded (EPUB
+                # <title>/<h1>, parsed page), i.e. the same strings the per-chapter lookup uses.
                 if self.should_translate:
+                    self.translator.telemetry.end_chapter()
                     try:
-                        trans_title = self.translator.translate(item['title'], glossary=current_glossary, source_lang=source_lang, target_lang=target_lang)
-                        trans_content = self.translator.translate(item['content'], glossary=current_glossary, source_lang=source_lang, target_lang=target_lang)
+                        self._translate_chapter_titles(novel_id, [item['title'] for item in raw_contents], source_lang, target_lang, current_glossary)
                     except Exception as e:
-                         raise Exception(f"Chapter translation failed (Required): {e}")
-                else:
-                    trans_title = item['title']
-                    trans_content = item['content']
+                        self.log(f"  Bulk title translation failed ({e}) - titles will be translated per chapter")
                 
-                prepared_chapters.append({
-                    'title': f"{translated_title} Chapter {item['num']}",
-                    'title_zh': item['title'],
-                    'content': trans_content,
-                    'story_id': story_id,
-                    'url': item['url'],
-                    'chapter_number': item['num']
-                })
+                # Translate & Upload
+                prepared_chapters = []
+                for item in raw_contents:
+                    if self.should_translate:
+                        self.translator.telemetry.set_chapter(item['num'])
+                        # Reuse a translation of this exact raw text from an earlier (failed/retried) run
+                        source_hash = self.file_manager.source_hash(item['content'])
+                        cached = self.file_manager.get_cached_chapter(novel_id, item['num'], is_translated=True, source_hash=source_hash)
+                        if cached:
+                            trans_title, trans_content = cached
+                            self.translator.telemetry.record_cache_hit()
+                            self.log(f"    Chapter {item['num']}: using cached translation")
+                        else:
+                            checkpoint = self._chunk_checkpoint(novel_id, item['num'], source_hash)
+                            models_used = self.translator.track_models()
+                            try:
+                                trans_title = self._translate_chapter_title(novel_id, item['title'], source_lang, target_lang, current_glossary)
+                                trans_content = self._translate_chapter_content(
+                                    novel_id, item['num'], item['content'],
+                                    lambda text: self.translator.translate(text, glossary=current_glossary, source_lang=source_lang, target_lang=target_lang, checkpoint=checkpoint),
+                                    source_lang, target_lang
+                                )
+                            except Exception as e:
+                                 raise Exception(f"Chapter translation failed (Required): {e}")
+                        
+                            self.file_manager.save_chapter(
+                                novel_id, item['num'], trans_title, trans_content, translated_title, is_translated=True,
+                                manifest_info={
+                                    'source_hash': source_hash,
+                                    'model': self._translation_model(models_used),
+                                    'glossary_version': self.file_manager.glossary_version(current_glossary)
+                                }
+                            )
+                            if checkpoint is not None:
+                                checkpoint.clear()
+                    else:
+                        trans_title = item['title']
+                        trans_content = item['content']
+                
+                    prepared_chapters.append({
+                        'title': f"{translated_title} Chapter {item['num']}",
+                        'title_zh': item['title'],
+                        'content': trans_content,
+                        'story_id': story_id,
+                        'url': item['url'],
+                        'chapter_number': item['num']
+                    })
             
-            # Upload Batch - This will internally use bulk_chapter_size=1 to split this batch of 5
-            if prepared_chapters:
-                self.process_chapters_in_batches(prepared_chapters, story_id, novel_url, len(novel_data['chapters']), job_data.get('job_id'))
+                # Upload Batch - This will internally use bulk_chapter_size=1 to split this batch of 5
+                if prepared_chapters:
+                    self.process_chapters_in_batches(prepared_chapters, story_id, novel_url, len(novel_data['chapters']), job_data.get('job_id'))
             
-            self.wordpress.update_job_status(job_data['job_id'], 'processing', f"Processed batch {b_idx + 1}/{total_batches}")
+                self.wordpress.update_job_status(job_data['job_id'], 'processing', f"Processed batch {b_idx + 1}/{total_batches}")
+        finally:
+            stopped.set()
+            prepare_executor.shutdown(wait=False, cancel_futures=True)
+        
+        if self.should_translate and self.translator and self.translator.service == 'openrouter':
+            for line in self.translator.router.summary():
+                self.log(f"  Model {line}")
 
         # REFRESH CACHE: Final story update to ensure chapter lists and caches are consistent
         self.log("Refreshing story cache and metadata...")
@@ -620,8 +744,191 @@ class NovelCrawler:
         self.log(f"Total novels processed: {total_novels_processed}")
         self.log("")
     
+    def _translate_memorized(self, novel_id, texts, target_lang, translate_list):
+        """Translate texts not yet in the novel's translation memory with translate_list(pending); returns the memory"""
+        known = self.file_manager.load_translation_memory(novel_id).get(target_lang, {})
+        pending = list(dict.fromkeys(text for text in texts if text and text not in known))
+        hits = len({text for text in texts if text}) - len(pending)
+        if hits and self.translator:
+            self.translator.telemetry.record_cache_hit(hits)
+        if pending:
+            translations = {text: translation for text, translation in zip(pending, translate_list(pending)) if translation}
+            if translations:
+                self.file_manager.add_translations(novel_id, target_lang, translations)
+            known = self.file_manager.load_translation_memory(novel_id).get(target_lang, {})
+        return known
+    
+    def _translate_chapter_titles(self, novel_id, titles, source_lang='zh-CN', target_lang='en', glossary=None):
+        """Translate all pending chapter titles in bulk; returns {title: translation} from the translation memory"""
+        def translate_list(pending):
+            if len(pending) > 1:
+                self.log(f"  Translating {len(pending)} chapter titles in bulk...")
+            return self.translator.translate_titles(pending, source_lang, target_lang, glossary)
+        return self._translate_memorized(novel_id, titles, target_lang, translate_list)
+    
+    def _translate_chapter_title(self, novel_id, title, source_lang='zh-CN', target_lang='en', glossary=None):
+        """One chapter title, served from the translation memory when the bulk stage already covered it"""
+        return self._translate_chapter_titles(novel_id, [title], source_lang, target_lang, glossary).get(title, title)
+    
+    def _chunk_checkpoint(self, novel_id, chapter_num, source_hash):
+        """Checkpoint for a chapter's translated chunks (None when translation_checkpoints is off)"""
+        if not self.config.get('translation_checkpoints', True):
+            return None
+        checkpoint = ChunkCheckpoint(self.file_manager, novel_id, chapter_num, source_hash)
+        if len(checkpoint):
+            self.log(f"    Resuming from checkpoint ({len(checkpoint)} chunks already translated)")
+        return checkpoint
+    
+    def _log_translation_telemetry(self):
+        """Close the translator's telemetry job and log its token/cost/latency summary"""
+        for line in self.translator.telemetry.end_job():
+            self.log(f"  {line}")
+    
+    def _boilerplate_index(self, novel_id):
+        if novel_id not in self._boilerplate_indexes:
+            self._boilerplate_indexes[novel_id] = BoilerplateIndex.from_dict(
+                self.file_manager.load_boilerplate_index(novel_id),
+                min_chapters=self.config.get('boilerplate_min_chapters', 5)
+            )
+        return self._boilerplate_indexes[novel_id]
+    
+    def _translate_chapter_content(self, novel_id, chapter_num, content, translate, source_lang='zh-CN', target_lang='en'):
+        """
+        Translate chapter text with translate(text), skipping repeated boilerplate paragraphs:
+        leading/trailing site notices and footers are stripped ('strip') or translated once
+        per novel through the translation memory ('cache').
+        """
+        if self.boilerplate_mode not in ('strip', 'cache'):
+            return translate(content)
+        
+        index = self._boilerplate_index(novel_id)
+        index.add_chapter(chapter_num, content)
+        self.file_manager.save_boilerplate_index(novel_id, index.to_dict())
+        leading, body, trailing = index.split(content)
+        if leading or trailing:
+            self.log(f"    Boilerplate: {len(leading) + len(trailing)} repeated paragraphs {'stripped' if self.boilerplate_mode == 'strip' else 'from cache'}")
+        
+        translated = translate(body) if body else ''
+        if self.boilerplate_mode == 'strip' or not (leading or trailing):
+            return translated
+        
+        known = self._translate_memorized(
+            novel_id, leading + trailing, target_lang,
+            lambda pending: self.translator.translate_many(pending, source_lang, target_lang)
+        )
+        parts = [known.get(p, p) for p in leading] + [translated] + [known.get(p, p) for p in trailing]
+        return '\n\n'.join(part for part in parts if part)
+    
+    def check_for_new_chapters(self, novel_url, known_total=0):
+        """
+        Fast "what's new" check for an already-synced novel.
+        Fetches only the chapter list and compares it to the stored snapshot.
+        Returns (chapters, new_chapters); (None, None) if the list could not be fetched.
+        """
+        novel_id = novel_url.rstrip('/').split('/')[-1]
+        chapters = self.parser.fetch_chapter_list(novel_id)
+        if not chapters:
+            return None, None
+        
+        new_chapters = self.file_manager.get_new_chapters(novel_url, chapters)
+        if new_chapters is None:
+            if self.file_manager.get_chapter_snapshot(novel_url):
+                # Already-synced part of the list changed - re-check everything against WordPress
+                self.log("  Chapter list changed since last sync - full re-check needed")
+                return chapters, chapters
+            # No snapshot yet (synced before snapshots existed) - fall back to the stored count
+            new_chapters = chapters[known_total:]
+        
+        return chapters, new_chapters
+    
+    def scan_for_updates(self, max_workers=None):
+        """
+        Check every tracked novel for new chapters concurrently (chapter lists only).
+        Novels that grew are queued in crawler state, most new chapters first.
+        """
+        max_workers = max_workers or self.update_scan_workers
+        state = self.file_manager.load_crawler_state()
+        tracked = list(state['processed_novels'].items())
+        
+        self.log("\n" + "="*50)
+        self.log(f"Scanning {len(tracked)} tracked novels for updates ({max_workers} workers)")
+        self.log("="*50 + "\n")
+        
+        def check(novel_url, progress):
+            chapters, new_chapters = self.check_for_new_chapters(novel_url, progress.get('chapters_total', 0))
+            return novel_url, chapters, new_chapters
+        
+        update_queue = []
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(check, url, progress) for url, progress in tracked]
+            for future in as_completed(futures):
+                try:
+                    novel_url, chapters, new_chapters = future.result()
+                except Exception as e:
+                    self.log(f"  ✗ Update check failed: {e}")
+                    failed += 1
+                    continue
+                
+                if chapters is None:
+                    failed += 1
+                elif new_chapters:
+                    self.log(f"  + {len(new_chapters)} new: {novel_url}")
+                    update_queue.append({
+                        'url': novel_url,
+                        'new_chapters': len(new_chapters),
+                        'chapters_total': len(chapters)
+                    })
+        
+        update_queue.sort(key=lambda item: item['new_chapters'], reverse=True)
+        
+        state = self.file_manager.load_crawler_state()
+        state['update_queue'] = update_queue
+        self.file_manager.save_crawler_state(state)
+        
+        self.log(f"\n✓ Scan complete: {len(update_queue)} novels with new chapters, "
+                 f"{len(tracked) - len(update_queue) - failed} up to date, {failed} unavailable")
+        return update_queue
+    
+    def run_update_queue(self):
+        """Crawl queued novels in priority order (resumable: finished entries are removed)"""
+        while True:
+            state = self.file_manager.load_crawler_state()
+            update_queue = state.get('update_queue', [])
+            if not update_queue:
+                break
+            
+            item = update_queue[0]
+            self.log(f"\n--- Update {item['url']} (+{item['new_chapters']} chapters, {len(update_queue)} queued) ---")
+            try:
+                self.crawl_novel(item['url'])
+            except KeyboardInterrupt:
+                self.log("\n\n⚠ Interrupted by user. Remaining novels stay queued.")
+                return
+            except Exception as e:
+                self.log(f"✗ Error updating novel: {e}")
+                import traceback
+                traceback.print_exc()
+            
+            state = self.file_manager.load_crawler_state()
+            state['update_queue'] = [q for q in state.get('update_queue', []) if q['url'] != item['url']]
+            self.file_manager.save_crawler_state(state)
+            time.sleep(self.delay)
+    
     def crawl_novel(self, novel_url):
         """Main crawling process"""
+        # Telemetry covers every translator call of the novel (metadata, titles, chapters),
+        # and its summary is logged however the crawl ends
+        track = self.should_translate and self.translator and self.translator.client
+        if track:
+            self.translator.telemetry.start_job(novel_url)
+        try:
+            return self._crawl_novel(novel_url)
+        finally:
+            if track:
+                self._log_translation_telemetry()
+    
+    def _crawl_novel(self, novel_url):
         self.log("\n" + "="*50)
         self.log("Starting Novel Crawler")
         self.log("="*50 + "\n")
@@ -639,10 +946,17 @@ class NovelCrawler:
             
             # Only skip if all chapters are truly done
             if chapters_crawled >= chapters_total:
-                self.log(f"✓ Novel already fully completed: {novel_url}")
-                self.log(f"  All {chapters_crawled}/{chapters_total} chapters processed")
-                self.log(f"  Story ID: {novel_progress.get('story_id')}")
-                return
+                # 🚀 OPTIMIZATION: Fast "what's new" check (one chapter-list request, no WordPress/LLM calls)
+                chapters, new_chapters = self.check_for_new_chapters(novel_url, chapters_total)
+                if not new_chapters:
+                    self.log(f"✓ Novel already fully completed: {novel_url}")
+                    self.log(f"  All {chapters_crawled}/{chapters_total} chapters processed")
+                    self.log(f"  Story ID: {novel_progress.get('story_id')}")
+                    return
+                
+                resume_from_chapter = len(chapters) - len(new_chapters)
+                self.log(f"⟳ Novel has {len(new_chapters)} new chapters since last sync: {novel_url}")
+                self.log(f"  Resuming from chapter {resume_from_chapter + 1}")
             else:
                 # Marked completed but not all chapters done - resume
                 self.log(f"⟳ Novel marked completed but has more chapters: {novel_url}")
@@ -682,7 +996,7 @@ class NovelCrawler:
         
         if self.should_translate and self.translator and self.translator.client:
             # Check if already translated in metadata
-            existing_metadata_path = os.path.join('novels', f'novel_{novel_id}', 'metadata.json')
+            existing_metadata_path = os.path.join(self.file_manager.novel_dir(novel_id), 'metadata.json')
             
             # Helper to generate AI metadata if needed
             def ensure_ai_metadata(title, desc):
@@ -763,6 +1077,7 @@ class NovelCrawler:
                     chapters_crawled=len(novel_data['chapters']),
                     chapters_total=len(novel_data['chapters']),
                     story_id=story_id)
+                self.file_manager.save_chapter_snapshot(novel_url, novel_data['chapters'])
                 return
             else:
                 self.log(f"  Novel incomplete ({chapter_status['chapters_count']}/{len(novel_data['chapters'])} chapters) - continuing...")
@@ -779,7 +1094,7 @@ class NovelCrawler:
         if novel_data['cover_url']:
             try:
                 cover_filename = self.file_manager.download_cover(novel_id, novel_data['cover_url'])
-                cover_path = os.path.join('novels', f'novel_{novel_id}', cover_filename)
+                cover_path = os.path.join(self.file_manager.novel_dir(novel_id), cover_filename)
                 self.log(f"  Cover downloaded: {cover_filename}")
             except Exception as e:
                 self.log(f"  Failed to download cover: {e}")
@@ -858,6 +1173,15 @@ class NovelCrawler:
         
         # PHASE 1: Crawl and translate all chapters (sequential to maintain order)
         self.log(f"\n  Phase 1: Crawling & translating chapters...")
+        if self.should_translate and self.translator and self.translator.client:
+            pending_titles = [
+                chapter['title'] for idx, chapter in enumerate(chapters_to_process, start=start_chapter)
+                if not existing_chapter_set or idx not in existing_chapter_set
+            ]
+            try:
+                self._translate_chapter_titles(novel_id, pending_titles)
+            except Exception as e:
+                self.log(f"  Bulk title translation failed ({e}) - titles will be translated per chapter")
         prepared_chapters = []  # List to store prepared chapter data in order
         chapters_existed = 0
         
@@ -878,41 +1202,46 @@ class NovelCrawler:
                     chapters_existed += 1
                     continue
             
-            # Parse chapter content
-            title, content = self.parser.parse_chapter_page(chapter['url'])
-            if not content:
-                self.log("    Skipped (no content found)")
-                continue
-            
-            self.log(f"    Extracted {len(content)} characters")
-            
-            # Save raw chapter
-            raw_filename = self.file_manager.save_chapter(novel_id, idx, title, content, novel_title_raw, is_translated=False)
-            self.log(f"    Saved to {raw_filename}")
+            # Parse chapter content (reuse the stored raw chapter from an earlier run if there is one)
+            cached_raw = self.file_manager.get_cached_chapter(novel_id, idx, is_translated=False)
+            if cached_raw:
+                title, content = cached_raw
+                self.log(f"    Using stored raw chapter ({len(content)} characters, no re-fetch)")
+            else:
+                title, content = self.parser.parse_chapter_page(chapter['url'])
+                if not content:
+                    self.log("    Skipped (no content found)")
+                    continue
+                
+                self.log(f"    Extracted {len(content)} characters")
+                
+                # Save raw chapter
+                raw_filename = self.file_manager.save_chapter(novel_id, idx, title, content, novel_title_raw, is_translated=False)
+                self.log(f"    Saved to {raw_filename}")
             
             # Translate if enabled
+            source_hash = self.file_manager.source_hash(content)
+            checkpoint = None
+            chapter_model = self._translation_model()
             if self.should_translate and self.translator and self.translator.client:
-                # Check if translated file already exists
-                translated_dir = os.path.join('novels', f'novel_{novel_id}', 'chapters_translated')
-                safe_novel_name = novel_title_translated.replace(' ', '_').replace('/', '_').replace('\\', '_')[:50]
-                translated_filepath = os.path.join(translated_dir, f"{safe_novel_name}_Chapter_{idx:03d}.html")
+                self.translator.telemetry.set_chapter(idx)
+                # Check the manifest for a translation of this exact raw text
+                cached = self.file_manager.get_cached_chapter(novel_id, idx, is_translated=True, source_hash=source_hash)
                 
-                if os.path.exists(translated_filepath):
-                    # Read existing translation
-                    with open(translated_filepath, 'r', encoding='utf-8') as f:
-                        translated_html = f.read()
-                        # Extract title and content from HTML
-                        import re
-                        title_match = re.search(r'<h1>(.*?)</h1>', translated_html, re.DOTALL)
-                        translated_title = title_match.group(1) if title_match else title
-                        content_match = re.search(r'</h1>\s*(.+)', translated_html, re.DOTALL)
-                        translated_content = content_match.group(1).strip() if content_match else content
+                if cached:
+                    chapter_title_translated, translated_content = cached
+                    chapter_model = self.file_manager.get_manifest_entry(novel_id, idx, is_translated=True).get('model')
+                    self.translator.telemetry.record_cache_hit()
                     self.log(f"    Using cached translation")
                 else:
+                    # Completed chunks survive retries and killed runs; only missing chunks are translated
+                    checkpoint = self._chunk_checkpoint(novel_id, idx, source_hash)
+                    models_used = self.translator.track_models()
+                    
                     # Retry translation with exponential backoff
                     max_retries = 10
                     retry_delay = 0
-                    translated_title = None
+                    chapter_title_translated = None
                     translated_content = None
                     
                     for attempt in range(max_retries):
@@ -921,8 +1250,11 @@ class NovelCrawler:
                                 self.log(f"    Translation retry {attempt}/{max_retries} (waiting {retry_delay}s)...")
                                 time.sleep(retry_delay)
                             
-                            translated_title = self.translator.translate(title)
-                            translated_content = self.translator.translate(content)
+                            chapter_title_translated = self._translate_chapter_title(novel_id, title)
+                            translated_content = self._translate_chapter_content(
+                                novel_id, idx, content, lambda text: self.translator.translate(text, checkpoint=checkpoint)
+                            )
+                            chapter_model = self._translation_model(models_used)
                             self.log(f"    Translated")
                             break
                         except Exception as e:
@@ -934,16 +1266,25 @@ class NovelCrawler:
                                 self.log(f"    STOPPING: Cannot proceed without translation for chapter {idx}")
                                 return
                     
-                    if not translated_title or not translated_content:
+                    if not chapter_title_translated or not translated_content:
                         self.log(f"    CRITICAL: Translation failed for chapter {idx}")
                         self.log(f"    STOPPING: Cannot proceed without translation")
                         return
             else:
-                translated_title = title
+                chapter_title_translated = title
                 translated_content = content
             
             # Save translated chapter
-            translated_filename = self.file_manager.save_chapter(novel_id, idx, translated_title, translated_content, novel_title_translated, is_translated=True)
+            translated_filename = self.file_manager.save_chapter(
+                novel_id, idx, chapter_title_translated, translated_content, novel_title_translated, is_translated=True,
+                manifest_info={
+                    'source_hash': source_hash,
+                    'model': chapter_model,
+                    'glossary_version': None
+                }
+            )
+            if checkpoint is not None:
+                checkpoint.clear()
             self.log(f"    Saved to {translated_filename}")
             
             # Prepare chapter data for batch creation (maintain order)
@@ -986,6 +1327,9 @@ class NovelCrawler:
             chapters_total=len(novel_data['chapters']),
             story_id=story_id
         )
+        if status == 'completed':
+            # Snapshot the synced chapter list for the next "what's new" check
+            self.file_manager.save_chapter_snapshot(novel_url, novel_data['chapters'])
         
         # Summary
         self.log("\n" + "="*50)
@@ -1040,6 +1384,7 @@ class NovelCrawler:
         self.log(f"Chapters existed (skipped): {chapters_existed + chapters_uploaded_existed}")
         self.log(f"Total processed: {chapters_created + chapters_existed + chapters_uploaded_existed}")
         self.log("")
+        self.file_manager.flush()
 
 
 def main():
@@ -1053,11 +1398,29 @@ def main():
             traceback.print_exc()
         return
 
+    if len(sys.argv) > 1 and sys.argv[1] == '--check-updates':
+        scan_only = '--scan-only' in sys.argv[2:]
+        numeric_args = [arg for arg in sys.argv[2:] if arg.isdigit()]
+        max_workers = int(numeric_args[0]) if numeric_args else None
+        try:
+            crawler = NovelCrawler()
+            crawler.scan_for_updates(max_workers)
+            if not scan_only:
+                crawler.run_update_queue()
+        except Exception as e:
+            print(f"Error: {e}", flush=True)
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+        return
+
     if len(sys.argv) < 2:
         print("Usage: python crawler.py <url> [max_pages]")
         print("       python crawler.py --worker")
+        print("       python crawler.py --check-updates [max_workers] [--scan-only]")
         print("\nExamples:")
         print("  Worker:   python crawler.py --worker")
+        print("  Updates:  python crawler.py --check-updates 16")
         print("  Novel:    python crawler.py https://www.ttkan.co/novel/chapters/novel_id")
         print("  Category: python crawler.py https://www.ttkan.co/novel/rank")
         print("  Category: python crawler.py https://www.ttkan.co/novel/rank 5")
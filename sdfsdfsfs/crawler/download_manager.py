@@ -0,0 +1,155 @@
+"""
+Resumable, cached downloads for large job inputs (EPUB files)
+"""
+
+import os
+import json
+import time
+import hashlib
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class DownloadManager:
+    def __init__(self, logger, cache_dir=os.path.join('temp', 'downloads'), timeout=(10, 60), max_retries=5):
+        self.logger = logger
+        self.cache_dir = cache_dir
+        self.timeout = timeout  # (connect, read) - read timeout applies per chunk
+        self.max_retries = max_retries
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _paths(self, url, suffix):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+        path = os.path.join(self.cache_dir, key + suffix)
+        return path, path + '.part', path + '.json'
+
+    def _load_meta(self, meta_path):
+        if os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (ValueError, OSError):
+                pass
+        return {}
+
+    def _save_meta(self, meta_path, meta):
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _is_fresh(self, url, meta, path):
+        """Revalidate a cached file with a HEAD request (ETag / size); offline keeps the cache"""
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+        except requests.RequestException:
+            return True
+        if response.status_code != 200:
+            return True
+
+        etag = response.headers.get('ETag')
+        if etag and meta.get('etag') and etag != meta['etag']:
+            return False
+        length = response.headers.get('Content-Length')
+        if length and int(length) != os.path.getsize(path):
+            return False
+        return True
+
+    def fetch(self, url, suffix='', validate=None):
+        """
+        Download url into the cache (or reuse a complete cached copy) and return the local path.
+        Interrupted downloads resume from the partial file with HTTP Range requests.
+        `validate(path)` is an optional completeness check (e.g. zipfile.is_zipfile).
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path, part_path, meta_path = self._paths(url, suffix)
+        meta = self._load_meta(meta_path)
+
+        if meta.get('complete') and os.path.exists(path):
+            if self._is_fresh(url, meta, path):
+                self.logger(f"  Using cached download: {path}")
+                return path
+            self.logger("  Cached download is outdated - downloading again")
+            os.remove(path)
+            meta = {}
+
+        last_error = None
+        for attempt in range(self.max_retries):
+            try:
+                if attempt > 0:
+                    wait_time = min(60, 2 ** attempt)
+                    self.logger(f"  Download retry {attempt}/{self.max_retries - 1} in {wait_time}s (resuming)...")
+                    time.sleep(wait_time)
+                meta = self._download(url, part_path, meta_path, meta)
+                break
+            except (requests.RequestException, OSError) as e:
+                last_error = e
+                self.logger(f"  Download interrupted: {e}")
+        else:
+            raise Exception(f"Download failed after {self.max_retries} attempts: {last_error}")
+
+        size = os.path.getsize(part_path)
+        if meta.get('total') is not None and size != meta['total']:
+            os.remove(part_path)
+            raise Exception(f"Incomplete download: {size} of {meta['total']} bytes")
+        if validate and not validate(part_path):
+            os.remove(part_path)
+            raise Exception("Downloaded file failed validation")
+
+        os.replace(part_path, path)
+        meta['complete'] = True
+        self._save_meta(meta_path, meta)
+        return path
+
+    def _download(self, url, part_path, meta_path, meta):
+        """Download (or resume) into part_path; returns the updated metadata"""
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = meta.get('etag') or meta.get('last_modified')
+
+        headers = {}
+        if offset and validator:
+            # If-Range: the server sends the full file instead if it changed since
+            headers['Range'] = f'bytes={offset}-'
+            headers['If-Range'] = validator
+        else:
+            offset = 0
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416:
+                if meta.get('total') == offset:
+                    return meta  # Partial file is already complete
+                # Partial file does not fit the remote file (e.g. larger than it) - start over
+                self.logger("  Partial download does not match the server's file - downloading again")
+                response.close()
+                os.remove(part_path)
+                if os.path.exists(meta_path):
+                    os.remove(meta_path)
+                return self._download(url, part_path, meta_path, {})
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                mode = 'ab'
+                self.logger(f"  Resuming download at {offset} bytes")
+            else:
+                mode = 'wb'
+                offset = 0
+
+            length = response.headers.get('Content-Length')
+            meta = {
+                'url': url,
+                'etag': response.headers.get('ETag') or meta.get('etag'),
+                'last_modified': response.headers.get('Last-Modified') or meta.get('last_modified'),
+                'total': offset + int(length) if length else None,
+                'complete': False
+            }
+            self._save_meta(meta_path, meta)
+
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
+
+        return meta
@@ -6,111 +6,218 @@ except ImportError:
     ebooklib = None
     epub = None
 from bs4 import BeautifulSoup
+from epub_reader import EpubZipReader
 
 class EpubParser:
     def __init__(self, logger):
         self.logger = logger
-        if not ebooklib:
-            self.logger.warning("ebooklib not installed. EpubParser will not function.")
+        self.reader = None
 
-    def parse_novel_info(self, epub_path):
+    def open_book(self, epub_path, cover_dir=None):
         """
-        Parses metadata from an EPUB file.
-        Returns a dictionary with title, author, description, cover_url, and empty chapters list.
+        Opens an EPUB file once and returns (novel_info, chapters).
+        novel_info has title, author, description, cover_url, cover_path and the chapters list.
+        Chapters are lightweight handles in spine order; bodies are only decoded
+        when passed to load_chapter() (or iterated with iter_chapters()).
+        If cover_dir is given, the cover image is extracted there (cover_path).
         """
+        self.close()
+        try:
+            # Streaming zip reader: only the documents asked for are ever decompressed
+            self.reader = EpubZipReader(epub_path)
+            return self._open_with_reader(epub_path, cover_dir)
+        except Exception as e:
+            self.close()
+            self.logger(f"Warning: Streaming EPUB reader failed ({e}), falling back to ebooklib")
+
         if not ebooklib:
-            self.logger.error("ebooklib not available.")
-            return None
+            self.logger("ERROR: ebooklib not available.")
+            return None, []
 
         try:
             book = epub.read_epub(epub_path)
-            
-            # Extract title (DC_TITLE)
-            # get_metadata returns a list of tuples like [(value, metadata_dict), ...]
-            titles = book.get_metadata('DC', 'title')
-            title = titles[0][0] if titles else "Unknown Title"
-            
-            # Extract author (DC_CREATOR)
-            creators = book.get_metadata('DC', 'creator')
-            author = creators[0][0] if creators else "Unknown Author"
-            
-            # Extract description (DC_DESCRIPTION)
-            descriptions = book.get_metadata('DC', 'description')
-            description = descriptions[0][0] if descriptions else "No description available"
-            
-            # Clean HTML from description if present
-            if description and '<' in description and '>' in description:
-                soup = BeautifulSoup(description, 'html.parser')
-                description = soup.get_text()
-
-            # Extract cover image (placeholder)
-            # Could iterate items to find ITEM_COVER or check manifest
-            cover_url = None
-            
-            return {
+        except Exception as e:
+            self.logger(f"ERROR: Error reading EPUB {epub_path}: {e}")
+            return None, []
+
+        novel_info = self._parse_metadata(book)
+        chapters = self._list_chapters(book, epub_path)
+        novel_info['chapters'] = chapters
+        return novel_info, chapters
+
+    def close(self):
+        """Close the underlying archive (if opened by the streaming reader)"""
+        if self.reader:
+            self.reader.close()
+            self.reader = None
+
+    def _open_with_reader(self, epub_path, cover_dir):
+        metadata = self.reader.metadata
+        description = metadata['description'] or "No description available"
+
+        # Clean HTML from description if present
+        if '<' in description and '>' in description:
+            description = BeautifulSoup(description, 'html.parser').get_text()
+
+        cover_path = None
+        if cover_dir:
+            try:
+                cover_path = self.reader.extract_cover(cover_dir)
+            except Exception as e:
+                self.logger(f"Warning: Failed to extract EPUB cover: {e}")
+
+        toc_titles = self.reader.toc_titles()
+        epub_abspath = os.path.abspath(epub_path)
+        chapters = [
+            {
+                'title': toc_titles.get(path),
+                'url': f"file://{epub_abspath}#{item_id}",
+                'path': path
+            }
+            for item_id, path in self.reader.documents()
+        ]
+
+        novel_info = {
+            'title': metadata['title'] or "Unknown Title",
+            'author': metadata['creator'] or "Unknown Author",
+            'description': description,
+            'cover_url': None,  # Local EPUB: the cover is only available as a file
+            'cover_path': cover_path,
+            'chapters': chapters
+        }
+        return novel_info, chapters
+
+    def _parse_metadata(self, book):
+        # Extract title (DC_TITLE)
+        # get_metadata returns a list of tuples like [(value, metadata_dict), ...]
+        titles = book.get_metadata('DC', 'title')
+        title = titles[0][0] if titles else "Unknown Title"
+
+        # Extract author (DC_CREATOR)
+        creators = book.get_metadata('DC', 'creator')
+        author = creators[0][0] if creators else "Unknown Author"
+
+        # Extract description (DC_DESCRIPTION)
+        descriptions = book.get_metadata('DC', 'description')
+        description = descriptions[0][0] if descriptions else "No description available"
+
+        # Clean HTML from description if present
+        if description and '<' in description and '>' in description:
+            soup = BeautifulSoup(description, 'html.parser')
+            description = soup.get_text()
+
+        # Extract cover image (placeholder)
+        # Could iterate items to find ITEM_COVER or check manifest
+        cover_url = None
+
+        return {
+            'title': title,
+            'author': author,
+            'description': description,
+            'cover_url': cover_url,
+            'cover_path': None,
+            'chapters': []
+        }
+
+    def _toc_titles(self, book):
+        """Map document href -> title from the table of contents"""
+        titles = {}
+
+        def walk(entries):
+            for entry in entries:
+                if isinstance(entry, tuple):
+                    section, children = entry
+                    if getattr(section, 'href', None):
+                        titles.setdefault(section.href.split('#')[0], section.title)
+                    walk(children)
+                elif getattr(entry, 'href', None):
+                    titles.setdefault(entry.href.split('#')[0], entry.title)
+
+        walk(book.toc or [])
+        return titles
+
+    def _list_chapters(self, book, epub_path):
+        """Build chapter handles in spine (reading) order without decoding any bodies"""
+        toc_titles = self._toc_titles(book)
+        epub_abspath = os.path.abspath(epub_path)
+        chapters = []
+        for idref, _linear in book.spine:
+            item = book.get_item_with_id(idref)
+            if item is None or item.get_type() != ebooklib.ITEM_DOCUMENT:
+                continue
+            if isinstance(item, epub.EpubNav):
+                continue  # Table of contents page, not a chapter
+            chapters.append({
+                'title': toc_titles.get(item.get_name()),
+                'url': f"file://{epub_abspath}#{item.get_id()}",
+                'item': item
+            })
+        return chapters
+
+    def load_chapter(self, chapter, position=None):
+        """
+        Decodes one chapter handle. Returns (title, html_content), or (None, None) on failure.
+        """
+        item = chapter.get('item')
+        item_id = item.get_id() if item is not None else chapter['path']
+        try:
+            if item is not None:
+                document = item.get_content()
+            else:
+                document = self.reader.read(chapter['path'])
+            soup = BeautifulSoup(document, 'html.parser')
+
+            # Extract title
+            # Try <title>, then <h1>, then TOC title, then fallback
+            chapter_title = chapter.get('title') or f"Chapter {position or 1}"
+            if soup.title and soup.title.string:
+                chapter_title = soup.title.string.strip()
+            else:
+                h1 = soup.find('h1')
+                if h1:
+                    chapter_title = h1.get_text().strip()
+
+            # Extract content (using body if available to avoid full html structure repetition)
+            body = soup.find('body')
+            if body:
+                # minimal cleanup could happen here
+                html_content = body.decode_contents()
+            else:
+                html_content = str(soup)
+
+            return chapter_title, html_content
+        except Exception as item_error:
+            self.logger(f"Warning: Failed to parse item {item_id}: {item_error}")
+            return None, None
+
+    def iter_chapters(self, chapters):
+        """
+        Lazily yields decoded chapters (title, url, content) in spine order.
+        """
+        for position, chapter in enumerate(chapters, 1):
+            title, content = self.load_chapter(chapter, position)
+            if content is None:
+                continue
+            yield {
                 'title': title,
-                'author': author,
-                'description': description,
-                'cover_url': cover_url,
-                'chapters': []
+                'url': chapter['url'],
+                'content': content
             }
 
-        except Exception as e:
-            self.logger.error(f"Error parsing EPUB info from {epub_path}: {e}")
-            return None
+    def parse_novel_info(self, epub_path):
+        """
+        Parses metadata from an EPUB file.
+        Returns a dictionary with title, author, description, cover_url, and empty chapters list.
+        """
+        novel_info, _ = self.open_book(epub_path)
+        if novel_info:
+            novel_info['chapters'] = []
+        return novel_info
 
     def extract_chapters(self, epub_path):
         """
         Extracts chapters from an EPUB file.
         Returns a list of dictionaries with title, url, and content.
         """
-        if not ebooklib:
-            self.logger.error("ebooklib not available.")
-            return []
-
-        chapters = []
-        try:
-            book = epub.read_epub(epub_path)
-            
-            # Iterate through documents
-            # Note: For strict reading order, iterating 'spine' is usually better, 
-            # but we follow the instruction to iterate items of type ITEM_DOCUMENT.
-            count = 1
-            for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT):
-                try:
-                    content = item.get_content()
-                    soup = BeautifulSoup(content, 'html.parser')
-                    
-                    # Extract title
-                    # Try <title>, then <h1>, then fallback
-                    chapter_title = f"Chapter {count}"
-                    if soup.title and soup.title.string:
-                        chapter_title = soup.title.string.strip()
-                    else:
-                        h1 = soup.find('h1')
-                        if h1:
-                            chapter_title = h1.get_text().strip()
-                    
-                    # Extract content (using body if available to avoid full html structure repetition)
-                    body = soup.find('body')
-                    if body:
-                        # minimal cleanup could happen here
-                        html_content = body.decode_contents()
-                    else:
-                        html_content = str(soup)
-
-                    chapters.append({
-                        'title': chapter_title,
-                        'url': f"file://{os.path.abspath(epub_path)}#{item.get_id()}",
-                        'content': html_content
-                    })
-                    count += 1
-                except Exception as item_error:
-                    self.logger.warning(f"Failed to parse item {item.get_id()} in {epub_path}: {item_error}")
-                    continue
-            
-            return chapters
-
-        except Exception as e:
-            self.logger.error(f"Error extracting chapters from {epub_path}: {e}")
-            return []
+        _, chapters = self.open_book(epub_path)
+        return list(self.iter_chapters(chapters))
@@ -0,0 +1,145 @@
+"""
+Lightweight streaming EPUB reader built on zipfile
+
+Reads the container and OPF package with a streaming XML parser and only
+decompresses the XHTML documents (and cover image) that are asked for, one at a
+time. Images, fonts and styles are never loaded.
+"""
+
+import os
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from urllib.parse import unquote
+
+
+CONTAINER_PATH = 'META-INF/container.xml'
+DOCUMENT_TYPES = ('application/xhtml+xml', 'text/html')
+
+
+def _local_name(tag):
+    """Strip the XML namespace from a tag name"""
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+class EpubZipReader:
+    def __init__(self, epub_path):
+        self.epub_path = epub_path
+        self.zip = zipfile.ZipFile(epub_path)
+        self.metadata = {'title': None, 'creator': None, 'description': None}
+        self.manifest = {}  # id -> {'href', 'media_type', 'properties'}
+        self.spine = []     # manifest ids in reading order
+        self.cover_id = None
+        self.ncx_id = None
+        self.opf_dir = ''
+        self._read_package()
+
+    def close(self):
+        self.zip.close()
+
+    def _iterparse(self, path, events=('end',)):
+        with self.zip.open(path) as f:
+            for event, element in ET.iterparse(f, events=events):
+                yield element if events == ('end',) else (event, element)
+
+    def _resolve(self, href):
+        """Resolve an OPF-relative href to a path inside the zip"""
+        return posixpath.normpath(posixpath.join(self.opf_dir, unquote(href.split('#')[0])))
+
+    def _read_package(self):
+        opf_path = None
+        for element in self._iterparse(CONTAINER_PATH):
+            if _local_name(element.tag) == 'rootfile' and element.get('full-path'):
+                opf_path = element.get('full-path')
+                break
+        if not opf_path:
+            raise ValueError("EPUB container does not reference a package document")
+        self.opf_dir = posixpath.dirname(opf_path)
+
+        for element in self._iterparse(opf_path):
+            name = _local_name(element.tag)
+            if name in self.metadata and self.metadata[name] is None and element.text:
+                self.metadata[name] = element.text.strip()
+            elif name == 'meta' and element.get('name') == 'cover':
+                self.cover_id = element.get('content')
+            elif name == 'item':
+                self.manifest[element.get('id')] = {
+                    'href': self._resolve(element.get('href', '')),
+                    'media_type': element.get('media-type', ''),
+                    'properties': (element.get('properties') or '').split()
+                }
+            elif name == 'itemref':
+                if element.get('idref'):
+                    self.spine.append(element.get('idref'))
+            elif name == 'spine':
+                self.ncx_id = element.get('toc')
+            element.clear()
+
+        if not self.cover_id:
+            for item_id, item in self.manifest.items():
+                if 'cover-image' in item['properties']:
+                    self.cover_id = item_id
+                    break
+
+    def toc_titles(self):
+        """Map document path -> title from the EPUB3 nav document or the EPUB2 NCX"""
+        titles = {}
+        nav_item = next((item for item in self.manifest.values() if 'nav' in item['properties']), None)
+        try:
+            if nav_item:
+                base = posixpath.dirname(nav_item['href'])
+                for element in self._iterparse(nav_item['href']):
+                    if _local_name(element.tag) == 'a' and element.get('href'):
+                        path = posixpath.normpath(posixpath.join(base, unquote(element.get('href').split('#')[0])))
+                        text = ''.join(element.itertext()).strip()
+                        if text:
+                            titles.setdefault(path, text)
+            elif self.ncx_id in self.manifest:
+                ncx_href = self.manifest[self.ncx_id]['href']
+                base = posixpath.dirname(ncx_href)
+                label = None
+                nav_depth = 0
+                for event, element in self._iterparse(ncx_href, events=('start', 'end')):
+                    name = _local_name(element.tag)
+                    if name == 'navPoint':
+                        nav_depth += 1 if event == 'start' else -1
+                    elif event != 'end' or not nav_depth:
+                        continue  # Only labels inside navPoints (skips docTitle)
+                    elif name == 'text' and label is None:
+                        label = (element.text or '').strip()
+                    elif name == 'content' and element.get('src'):
+                        path = posixpath.normpath(posixpath.join(base, unquote(element.get('src').split('#')[0])))
+                        if label:
+                            titles.setdefault(path, label)
+                        label = None
+        except (KeyError, ET.ParseError):
+            pass  # Missing or broken TOC - chapters fall back to in-document titles
+        return titles
+
+    def documents(self):
+        """Spine documents in reading order as (item_id, path), skipping the nav page"""
+        for item_id in self.spine:
+            item = self.manifest.get(item_id)
+            if not item or item['media_type'] not in DOCUMENT_TYPES or 'nav' in item['properties']:
+                continue
+            yield item_id, item['href']
+
+    def read(self, path):
+        """Decompress a single member"""
+        return self.zip.read(path)
+
+    def extract_cover(self, dest_dir):
+        """Write the cover image to dest_dir/cover.<ext>; returns the path or None"""
+        item = self.manifest.get(self.cover_id)
+        if not item or not item['media_type'].startswith('image/'):
+            return None
+        ext = os.path.splitext(item['href'])[1] or '.jpg'
+        os.makedirs(dest_dir, exist_ok=True)
+        cover_path = os.path.join(dest_dir, f'cover{ext}')
+        with self.zip.open(item['href']) as src, open(cover_path, 'wb') as dst:
+            while True:
+                chunk = src.read(65536)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        return cover_path
@@ -4,17 +4,136 @@ File management for novel content
 
 import os
 import json
+import atexit
+import shutil
+import hashlib
+import tempfile
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
+from chapter_archive import ChapterArchive, CHAPTER_FILE_RE, KIND_DIRS, PACK_FILE
+from blob_store import BlobStore, normalize_text
+
+
+STATE_FILE = 'crawler_state.json'
 
 
 class FileManager:
-    def __init__(self, logger):
+    def __init__(self, logger, config=None):
         self.logger = logger
+        config = config or {}
+        
+        # Root of all per-novel data. Mock translations (translation_service 'mock') get their
+        # own root by default, so benchmark output is never served to real runs
+        self.root = config.get('storage_root') or (
+            'novels_mock' if config.get('translation_service') == 'mock' else 'novels'
+        )
+        self.cover_store = os.path.join(self.root, '_covers')
+        self.mock_translations = config.get('translation_service') == 'mock'
+        
+        # Write-behind cache: JSON files are kept in memory and flushed atomically
+        # every `flush_interval` seconds, every `flush_every` updates, or at exit
+        self.flush_interval = config.get('state_flush_interval', 30)
+        self.flush_every = config.get('state_flush_every', 50)
+        self._state = None
+        self._lock = threading.RLock()
+        self._dirty_files = {}
+        self._pending_updates = 0
+        self._flush_timer = None
+        
+        # Chapter storage backend: 'files' (one HTML file per chapter) or 'archive'
+        self.chapter_storage = config.get('chapter_storage', 'files')
+        self._archives = {}
+        self._manifests = {}
+        self._translation_memories = {}
+        
+        # Raw chapters go to the shared content-addressed store (deduplicated across runs/mirrors)
+        self.raw_blob_store = config.get('raw_blob_store', False)
+        self._blob_store = None
+        self._session = None
+        atexit.register(self.flush)
+    
+    def _atomic_write_json(self, filepath, data):
+        """Write JSON through a temp file + rename so a crash never leaves a partial file"""
+        directory = os.path.dirname(filepath) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _mark_dirty(self, filepath, data):
+        """Queue an in-memory JSON document for the next flush"""
+        with self._lock:
+            self._dirty_files[filepath] = data
+            self._pending_updates += 1
+            
+            if self._pending_updates >= self.flush_every or self.flush_interval <= 0:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self):
+        """Write all dirty JSON documents to disk"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            
+            dirty_files = self._dirty_files
+            self._dirty_files = {}
+            self._pending_updates = 0
+            
+            for filepath, data in dirty_files.items():
+                try:
+                    self._atomic_write_json(filepath, data)
+                except Exception as e:
+                    self.logger(f"Failed to write {filepath}: {e}")
+                    # Keep newer data if it was re-queued meanwhile
+                    self._dirty_files.setdefault(filepath, data)
+            
+            if self._blob_store is not None:
+                try:
+                    self._blob_store.flush()
+                except Exception as e:
+                    self.logger(f"Failed to write blob references: {e}")
+            
+            for archive in self._archives.values():
+                try:
+                    archive.flush()
+                except Exception as e:
+                    self.logger(f"Failed to write archive index {archive.index_path}: {e}")
+    
+    def novel_dir(self, novel_id):
+        return os.path.join(self.root, f'novel_{novel_id}')
+    
+    def get_blob_store(self):
+        """Get the shared content-addressed raw chapter store"""
+        with self._lock:
+            if self._blob_store is None:
+                self._blob_store = BlobStore(os.path.join(self.root, '_blobs'))
+            return self._blob_store
+    
+    def get_archive(self, novel_id):
+        """Get the (cached) chapter archive for a novel"""
+        with self._lock:
+            if novel_id not in self._archives:
+                self._archives[novel_id] = ChapterArchive(self.novel_dir(novel_id))
+            return self._archives[novel_id]
     
     def save_metadata(self, novel_id, metadata):
         """Save novel metadata to JSON file"""
-        novel_dir = os.path.join('novels', f'novel_{novel_id}')
+        novel_dir = self.novel_dir(novel_id)
         os.makedirs(novel_dir, exist_ok=True)
         
         filepath = os.path.join(novel_dir, 'metadata.json')
@@ -23,17 +142,150 @@ class FileManager:
         
         return filepath
     
-    def save_chapter(self, novel_id, chapter_number, title, content, novel_name='', is_translated=False):
-        """Save chapter content to HTML file"""
-        novel_dir = os.path.join('novels', f'novel_{novel_id}')
+    @staticmethod
+    def content_hash(text):
+        """Stable hash of chapter text (used for cache validation in the manifest)"""
+        return hashlib.sha1((text or '').encode('utf-8')).hexdigest()
+    
+    def source_hash(self, content):
+        """Hash of raw chapter text as stored: normalized when raw chapters go to the blob store"""
+        return self.content_hash(normalize_text(content) if self.raw_blob_store else content)
+    
+    @staticmethod
+    def glossary_version(glossary):
+        """Short hash identifying a glossary's contents (None for no glossary)"""
+        if not glossary:
+            return None
+        payload = json.dumps(glossary, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+    
+    def load_manifest(self, novel_id):
+        """Load the per-novel chapter manifest (cached in memory, written behind)"""
+        with self._lock:
+            if novel_id not in self._manifests:
+                filepath = os.path.join(self.novel_dir(novel_id), 'manifest.json')
+                manifest = None
+                if os.path.exists(filepath):
+                    try:
+                        with open(filepath, 'r', encoding='utf-8') as f:
+                            manifest = json.load(f)
+                    except (ValueError, OSError) as e:
+                        self.logger(f"Ignoring unreadable manifest {filepath}: {e}")
+                if manifest is None:
+                    manifest = self._rebuild_manifest(novel_id)
+                    if manifest['chapters']:
+                        self.logger(f"Rebuilt manifest for novel {novel_id} from {len(manifest['chapters'])} stored chapters")
+                        self._mark_dirty(filepath, manifest)
+                self._manifests[novel_id] = manifest
+            return self._manifests[novel_id]
+    
+    @staticmethod
+    def _split_chapter_html(html):
+        """(title, content) of a stored chapter page, None if it is not in save_chapter's layout"""
+        if not html or not html.startswith('<h1>') or '</h1>\n\n' not in html:
+            return None
+        title, content = html[len('<h1>'):].split('</h1>\n\n', 1)
+        return title, content
+    
+    def _rebuild_manifest(self, novel_id):
+        """
+        Manifest entries for chapters saved before the manifest existed (loose files and
+        the archive). A translation is tied to the raw chapter stored next to it.
+        """
+        novel_dir = self.novel_dir(novel_id)
+        has_archive = os.path.exists(os.path.join(novel_dir, PACK_FILE))
+        chapters = {}
+        for kind, dirname in KIND_DIRS.items():
+            found = {}
+            chapters_dir = os.path.join(novel_dir, dirname)
+            if os.path.isdir(chapters_dir):
+                for filename in sorted(os.listdir(chapters_dir)):
+                    match = CHAPTER_FILE_RE.search(filename)
+                    if match:
+                        found.setdefault(int(match.group(1)), ('files', filename))
+            if has_archive:
+                archive = self.get_archive(novel_id)
+                for number in archive.chapter_numbers(kind):
+                    if self.chapter_storage == 'archive' or number not in found:
+                        found[number] = ('archive', archive.index['chapters'][kind][str(number)].get('name'))
+            
+            for number, (storage, filename) in found.items():
+                html = self.load_chapter(novel_id, number, filename, kind == 'translated', storage=storage)
+                parsed = self._split_chapter_html(html)
+                if not parsed:
+                    continue
+                title, content = parsed
+                chapters.setdefault(str(number), {})[kind] = {
+                    'title': title,
+                    'hash': self.content_hash(content),
+                    'storage': storage,
+                    'filename': filename,
+                    'backfilled': True
+                }
+        
+        for entry in chapters.values():
+            if 'translated' in entry and 'raw' in entry:
+                entry['translated']['source_hash'] = entry['raw']['hash']
+        return {'chapters': chapters}
+    
+    def get_manifest_entry(self, novel_id, chapter_number, is_translated=False):
+        """Get the manifest record for a chapter's raw or translated version (None if not saved)"""
+        kind = 'translated' if is_translated else 'raw'
+        chapter = self.load_manifest(novel_id)['chapters'].get(str(chapter_number), {})
+        return chapter.get(kind)
+    
+    def _record_chapter(self, novel_id, chapter_number, kind, entry):
+        """Record a saved chapter in the manifest"""
+        import datetime
+        with self._lock:
+            manifest = self.load_manifest(novel_id)
+            entry['saved_at'] = datetime.datetime.now().isoformat()
+            manifest['chapters'].setdefault(str(chapter_number), {})[kind] = entry
+            self._mark_dirty(os.path.join(self.novel_dir(novel_id), 'manifest.json'), manifest)
+    
+    def get_cached_chapter(self, novel_id, chapter_number, is_translated=False, source_hash=None):
+        """
+        Return (title, content) of a saved chapter using only the manifest, or None.
+        For translations, `source_hash` must match the raw text the translation was made from.
+        """
+        entry = self.get_manifest_entry(novel_id, chapter_number, is_translated)
+        if not entry:
+            return None
+        if is_translated and (entry.get('model') == 'mock') != self.mock_translations:
+            return None  # Pseudo-translations are only reused by mock runs (and vice versa)
+        if source_hash is not None and entry.get('source_hash') != source_hash:
+            # A backfilled translation with no raw text to check against is trusted, as before the manifest
+            if not (entry.get('backfilled') and entry.get('source_hash') is None):
+                return None
+        
+        if entry.get('storage') == 'blob':
+            content = self.get_blob_store().get(entry['blob'])
+            # Entries recorded before blobs were normalized hash the raw text
+            if content is None or self.content_hash(content) != entry.get('hash'):
+                return None
+            return entry.get('title', ''), content
+        
+        html = self.load_chapter(novel_id, chapter_number, entry.get('filename'), is_translated, storage=entry.get('storage'))
+        prefix = f"<h1>{entry.get('title', '')}</h1>\n\n"
+        if html is None or not html.startswith(prefix):
+            return None
+        content = html[len(prefix):]
+        if self.content_hash(content) != entry.get('hash'):
+            return None
+        return entry.get('title', ''), content
+    
+    def save_chapter(self, novel_id, chapter_number, title, content, novel_name='', is_translated=False, manifest_info=None):
+        """
+        Save chapter content to HTML file (or archive) and record it in the manifest.
+        `manifest_info` holds extra fields such as source_hash, model and glossary_version.
+        """
+        novel_dir = self.novel_dir(novel_id)
         
         if is_translated:
             chapters_dir = os.path.join(novel_dir, 'chapters_translated')
         else:
             chapters_dir = os.path.join(novel_dir, 'chapters_raw')
         
-        os.makedirs(chapters_dir, exist_ok=True)
-        
         # Format: NovelName_Chapter_001.html
         # Sanitize filename (remove Windows reserved chars)
         safe_novel_name = novel_name
@@ -42,27 +294,128 @@ class FileManager:
         
         safe_novel_name = safe_novel_name.replace(' ', '_')[:50]
         filename = f"{safe_novel_name}_Chapter_{chapter_number:03d}.html"
-        filepath = os.path.join(chapters_dir, filename)
+        kind = 'translated' if is_translated else 'raw'
+        storage = 'blob' if (self.raw_blob_store and not is_translated) else self.chapter_storage
+        if storage == 'blob':
+            # Blobs hold normalized text; hash what get_cached_chapter will return
+            content = normalize_text(content)
+        html = f"<h1>{title}</h1>\n\n{content}"
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"<h1>{title}</h1>\n\n{content}")
+        entry = {
+            'title': title,
+            'hash': self.content_hash(content),
+            'storage': storage,
+            'filename': filename
+        }
+        entry.update(manifest_info or {})
+        
+        previous = self.get_manifest_entry(novel_id, chapter_number, is_translated)
+        unchanged = previous is not None and all(
+            previous.get(key) == entry[key] for key in ('title', 'hash', 'storage', 'filename')
+        ) and self._chapter_stored(novel_id, chapter_number, kind, previous)
+        
+        if unchanged:
+            # Identical chapter already stored - only refresh the manifest metadata
+            if 'blob' in previous:
+                entry['blob'] = previous['blob']
+        elif storage == 'blob':
+            blob_store = self.get_blob_store()
+            entry['blob'] = blob_store.put(content)
+            if not previous or previous.get('blob') != entry['blob']:
+                if blob_store.incref(entry['blob']) > 1:
+                    self.logger(f"    Raw content deduplicated (blob {entry['blob'][:12]} shared)")
+                if previous and previous.get('blob'):
+                    blob_store.decref(previous['blob'])
+        elif storage == 'archive':
+            self.get_archive(novel_id).put(kind, chapter_number, html, filename)
+        else:
+            os.makedirs(chapters_dir, exist_ok=True)
+            filepath = os.path.join(chapters_dir, filename)
+            
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(html)
+        
+        if previous and previous.get('blob') and storage != 'blob':
+            self.get_blob_store().decref(previous['blob'])
+        
+        self._record_chapter(novel_id, chapter_number, kind, entry)
         
         return filename
     
+    def _chapter_stored(self, novel_id, chapter_number, kind, entry):
+        """True if the copy a manifest entry points to can still be loaded (it may have been deleted)"""
+        storage = entry.get('storage')
+        if storage == 'blob':
+            return bool(entry.get('blob')) and self.get_blob_store().has(entry['blob'])
+        if storage == 'archive':
+            return self.get_archive(novel_id).has(kind, chapter_number)
+        subdir = 'chapters_translated' if kind == 'translated' else 'chapters_raw'
+        filename = entry.get('filename')
+        return bool(filename) and os.path.exists(os.path.join(self.novel_dir(novel_id), subdir, filename))
+    
+    def load_chapter(self, novel_id, chapter_number, filename, is_translated=False, storage=None):
+        """Load a saved chapter's HTML from the given (default: configured) backend, None if missing"""
+        if (storage or self.chapter_storage) == 'archive':
+            kind = 'translated' if is_translated else 'raw'
+            return self.get_archive(novel_id).get(kind, chapter_number)
+        
+        subdir = 'chapters_translated' if is_translated else 'chapters_raw'
+        filepath = os.path.join(self.novel_dir(novel_id), subdir, filename)
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return f.read()
+    
     def create_directories(self, novel_id):
         """Create directory structure for novel"""
-        novel_dir = os.path.join('novels', f'novel_{novel_id}')
+        novel_dir = self.novel_dir(novel_id)
         chapters_raw_dir = os.path.join(novel_dir, 'chapters_raw')
         chapters_translated_dir = os.path.join(novel_dir, 'chapters_translated')
         
+        if self.chapter_storage == 'archive':
+            os.makedirs(novel_dir, exist_ok=True)
+            return chapters_raw_dir, chapters_translated_dir
+        
         os.makedirs(chapters_raw_dir, exist_ok=True)
         os.makedirs(chapters_translated_dir, exist_ok=True)
         
         return chapters_raw_dir, chapters_translated_dir
     
+    def _get_session(self):
+        """Pooled HTTP session for cover downloads (keep-alive across novels)"""
+        if self._session is None:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
+    
+    def _link_shared_cover(self, digest, ext, tmp_path, filepath):
+        """Move a downloaded image into the shared cover store and link it as the novel's cover"""
+        os.makedirs(self.cover_store, exist_ok=True)
+        shared_path = os.path.join(self.cover_store, f'{digest}{ext}')
+        if os.path.exists(shared_path):
+            os.remove(tmp_path)  # Identical image already stored (e.g. a site placeholder)
+        else:
+            os.replace(tmp_path, shared_path)
+        
+        link_tmp = filepath + '.tmp'
+        if os.path.exists(link_tmp):
+            os.remove(link_tmp)
+        try:
+            os.link(shared_path, link_tmp)
+        except OSError:
+            shutil.copyfile(shared_path, link_tmp)  # Filesystem without hard links
+        os.replace(link_tmp, filepath)
+    
     def download_cover(self, novel_id, cover_url):
-        """Download cover image from URL"""
-        novel_dir = os.path.join('novels', f'novel_{novel_id}')
+        """
+        Download cover image from URL.
+        Streams to disk through the pooled session; an existing cover is revalidated with
+        a conditional request (ETag / Last-Modified in cover.json) instead of re-downloaded,
+        and identical images are stored once in <root>/_covers (keyed by SHA-256).
+        """
+        novel_dir = self.novel_dir(novel_id)
         os.makedirs(novel_dir, exist_ok=True)
         
         # Get file extension from URL
@@ -70,42 +423,87 @@ class FileManager:
         ext = os.path.splitext(parsed_url.path)[1] or '.jpg'
         filename = f'cover{ext}'
         filepath = os.path.join(novel_dir, filename)
+        info_path = os.path.join(novel_dir, 'cover.json')
         
-        # Download image
-        response = requests.get(cover_url, timeout=30)
-        response.raise_for_status()
+        info = {}
+        if os.path.exists(info_path):
+            try:
+                with open(info_path, 'r', encoding='utf-8') as f:
+                    info = json.load(f)
+            except (ValueError, OSError):
+                info = {}
         
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
+        headers = {}
+        if os.path.exists(filepath) and info.get('url') == cover_url:
+            if info.get('etag'):
+                headers['If-None-Match'] = info['etag']
+            if info.get('last_modified'):
+                headers['If-Modified-Since'] = info['last_modified']
+        
+        with self._get_session().get(cover_url, headers=headers, stream=True, timeout=(10, 30)) as response:
+            if response.status_code == 304:
+                return filename
+            response.raise_for_status()
+            
+            # Stream to a temp file, hashing as we go
+            digest = hashlib.sha256()
+            fd, tmp_path = tempfile.mkstemp(dir=novel_dir, prefix='.tmp_cover_')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        digest.update(chunk)
+                        f.write(chunk)
+                digest = digest.hexdigest()
+                
+                if digest == info.get('sha256') and os.path.exists(filepath):
+                    os.remove(tmp_path)  # Server sent the same image again
+                else:
+                    self._link_shared_cover(digest, ext, tmp_path, filepath)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            
+            self._atomic_write_json(info_path, {
+                'url': cover_url,
+                'filename': filename,
+                'sha256': digest,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            })
         
         return filename
     
     def load_crawler_state(self):
-        """Load crawler state from JSON file"""
-        state_file = 'crawler_state.json'
-        if os.path.exists(state_file):
-            with open(state_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {'processed_novels': {}, 'last_category_page': None}
+        """Load crawler state (read from disk once, then served from memory)"""
+        with self._lock:
+            if self._state is None:
+                if os.path.exists(STATE_FILE):
+                    with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                        self._state = json.load(f)
+                else:
+                    self._state = {'processed_novels': {}, 'last_category_page': None}
+            return self._state
     
     def save_crawler_state(self, state):
-        """Save crawler state to JSON file"""
-        state_file = 'crawler_state.json'
-        with open(state_file, 'w', encoding='utf-8') as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
+        """Save crawler state (batched write-behind, see flush())"""
+        with self._lock:
+            self._state = state
+            self._mark_dirty(STATE_FILE, state)
     
     def update_novel_progress(self, novel_url, status, chapters_crawled=0, chapters_total=0, story_id=None):
         """Update progress for a specific novel"""
-        state = self.load_crawler_state()
-        import datetime
-        state['processed_novels'][novel_url] = {
-            'status': status,  # 'in_progress', 'completed', 'failed'
-            'chapters_crawled': chapters_crawled,
-            'chapters_total': chapters_total,
-            'story_id': story_id,
-            'last_updated': datetime.datetime.now().isoformat()
-        }
-        self.save_crawler_state(state)
+        with self._lock:
+            state = self.load_crawler_state()
+            import datetime
+            state['processed_novels'][novel_url] = {
+                'status': status,  # 'in_progress', 'completed', 'failed'
+                'chapters_crawled': chapters_crawled,
+                'chapters_total': chapters_total,
+                'story_id': story_id,
+                'last_updated': datetime.datetime.now().isoformat()
+            }
+            self.save_crawler_state(state)
     
     def get_local_chapter_cache(self, story_id):
         """Get cached chapter numbers for a story (avoids WordPress API calls)"""
@@ -115,15 +513,16 @@ class FileManager:
     
     def update_local_chapter_cache(self, story_id, chapter_numbers):
         """Update local cache of chapter numbers for a story"""
-        state = self.load_crawler_state()
-        if 'chapter_cache' not in state:
-            state['chapter_cache'] = {}
-        cache_key = f'story_{story_id}_chapters'
-        # Convert set to list for JSON serialization
-        if isinstance(chapter_numbers, set):
-            chapter_numbers = list(chapter_numbers)
-        state['chapter_cache'][cache_key] = chapter_numbers
-        self.save_crawler_state(state)
+        with self._lock:
+            state = self.load_crawler_state()
+            if 'chapter_cache' not in state:
+                state['chapter_cache'] = {}
+            cache_key = f'story_{story_id}_chapters'
+            # Convert set to list for JSON serialization
+            if isinstance(chapter_numbers, set):
+                chapter_numbers = list(chapter_numbers)
+            state['chapter_cache'][cache_key] = chapter_numbers
+            self.save_crawler_state(state)
     
     def add_chapter_to_cache(self, story_id, chapter_number):
         """Add a single chapter to the cache"""
@@ -131,9 +530,53 @@ class FileManager:
         cached.add(chapter_number)
         self.update_local_chapter_cache(story_id, cached)
 
+    @staticmethod
+    def _chapter_tail_hash(chapters, count, tail_size=20):
+        """Hash the IDs of the last `tail_size` chapters among the first `count`"""
+        tail = chapters[max(0, count - tail_size):count]
+        key = '|'.join(str(ch.get('chapter_number', ch.get('url', ''))) for ch in tail)
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def get_chapter_snapshot(self, novel_url):
+        """Get the stored chapter-list snapshot for a novel (None if never synced)"""
+        state = self.load_crawler_state()
+        return state.get('chapter_snapshots', {}).get(novel_url)
+
+    def save_chapter_snapshot(self, novel_url, chapters):
+        """Store count and tail hash of the chapter list after a successful sync"""
+        with self._lock:
+            state = self.load_crawler_state()
+            if 'chapter_snapshots' not in state:
+                state['chapter_snapshots'] = {}
+            import datetime
+            state['chapter_snapshots'][novel_url] = {
+                'count': len(chapters),
+                'tail_hash': self._chapter_tail_hash(chapters, len(chapters)),
+                'synced_at': datetime.datetime.now().isoformat()
+            }
+            self.save_crawler_state(state)
+
+    def get_new_chapters(self, novel_url, chapters):
+        """
+        Compare a freshly fetched chapter list against the stored snapshot.
+        Returns the chapters added since the last sync, or None if there is no
+        snapshot or the already-synced part of the list changed (full sync needed).
+        """
+        snapshot = self.get_chapter_snapshot(novel_url)
+        if not snapshot:
+            return None
+        
+        count = snapshot.get('count', 0)
+        if len(chapters) < count:
+            return None
+        if self._chapter_tail_hash(chapters, count) != snapshot.get('tail_hash'):
+            return None
+        
+        return chapters[count:]
+
     def save_glossary(self, novel_id, glossary_data):
         """Save glossary to JSON file"""
-        novel_dir = os.path.join('novels', f'novel_{novel_id}')
+        novel_dir = self.novel_dir(novel_id)
         os.makedirs(novel_dir, exist_ok=True)
         
         filepath = os.path.join(novel_dir, 'glossary.json')
@@ -144,7 +587,7 @@ class FileManager:
 
     def load_glossary(self, novel_id):
         """Load glossary from JSON file"""
-        novel_dir = os.path.join('novels', f'novel_{novel_id}')
+        novel_dir = self.novel_dir(novel_id)
         filepath = os.path.join(novel_dir, 'glossary.json')
         
         if os.path.exists(filepath):
@@ -152,3 +595,85 @@ class FileManager:
                 return json.load(f)
         return []
 
+    def load_translation_memory(self, novel_id):
+        """
+        Per-novel translation memory: {target_lang: {source text: translation}}
+        (cached in memory, read-only for callers: add entries with add_translations)
+        """
+        with self._lock:
+            if novel_id not in self._translation_memories:
+                filepath = os.path.join(self.novel_dir(novel_id), 'translation_memory.json')
+                memory = {}
+                if os.path.exists(filepath):
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        memory = json.load(f)
+                self._translation_memories[novel_id] = memory
+            return self._translation_memories[novel_id]
+    
+    def add_translations(self, novel_id, target_lang, translations):
+        """Add {source text: translation} to the translation memory (batched write-behind, see flush())"""
+        with self._lock:
+            memory = self.load_translation_memory(novel_id)
+            memory.setdefault(target_lang, {}).update(translations)
+            self._mark_dirty(os.path.join(self.novel_dir(novel_id), 'translation_memory.json'), memory)
+    
+    def load_boilerplate_index(self, novel_id):
+        """Load the repeated-paragraph counts of a novel (see boilerplate.py)"""
+        filepath = os.path.join(self.novel_dir(novel_id), 'boilerplate.json')
+        with self._lock:
+            if filepath in self._dirty_files:
+                return self._dirty_files[filepath]
+        if os.path.exists(filepath):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return None
+    
+    def save_boilerplate_index(self, novel_id, index_data):
+        """Save repeated-paragraph counts (batched write-behind, see flush())"""
+        self._mark_dirty(os.path.join(self.novel_dir(novel_id), 'boilerplate.json'), index_data)
+    
+    def load_term_stats(self, novel_id):
+        """Load the glossary candidate-term counts of a novel (see term_miner.py)"""
+        filepath = os.path.join(self.novel_dir(novel_id), 'term_stats.json')
+        with self._lock:
+            if filepath in self._dirty_files:
+                return self._dirty_files[filepath]
+        if os.path.exists(filepath):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return None
+    
+    def save_term_stats(self, novel_id, stats):
+        """Save candidate-term counts (batched write-behind, see flush())"""
+        self._mark_dirty(os.path.join(self.novel_dir(novel_id), 'term_stats.json'), stats)
+
+    
+    def _chunk_checkpoint_path(self, novel_id, chapter_number):
+        return os.path.join(self.novel_dir(novel_id), 'checkpoints', f'chapter_{chapter_number}.json')
+    
+    def load_chunk_checkpoint(self, novel_id, chapter_number, source_hash):
+        """Translated chunks checkpointed for a chapter ({} if none, or if the raw text changed)"""
+        filepath = self._chunk_checkpoint_path(novel_id, chapter_number)
+        if not os.path.exists(filepath):
+            return {}
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (ValueError, OSError) as e:
+            self.logger(f"Ignoring unreadable checkpoint {filepath}: {e}")
+            return {}
+        if checkpoint.get('source_hash') != source_hash:
+            return {}
+        return checkpoint.get('chunks', {})
+    
+    def save_chunk_checkpoint(self, novel_id, chapter_number, source_hash, chunks):
+        """Write a chapter's translated chunks at once (not write-behind: it must survive a killed run)"""
+        self._atomic_write_json(
+            self._chunk_checkpoint_path(novel_id, chapter_number),
+            {'source_hash': source_hash, 'chunks': chunks}
+        )
+    
+    def clear_chunk_checkpoint(self, novel_id, chapter_number):
+        filepath = self._chunk_checkpoint_path(novel_id, chapter_number)
+        if os.path.exists(filepath):
+            os.remove(filepath)
@@ -0,0 +1,129 @@
+"""
+Offline stand-in for the OpenRouter chat completions API
+
+Selected with translation_service: 'mock'. Requests never leave the machine:
+replies are deterministic pseudo-translations (CJK text becomes pseudo-words,
+everything else is kept) with simulated latency, token usage, 429s, server
+errors and truncated replies, so concurrency, batching and cache changes can be
+benchmarked reproducibly without network access. Everything above the HTTP call
+(model routing, rate budget, chunking, telemetry) runs unchanged.
+
+Outcomes are drawn from a generator seeded by (mock_seed, request content,
+how often that content was requested), so a run gives the same results
+regardless of thread interleaving, and a retried request gets a fresh draw.
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from collections import Counter
+from rate_limiter import estimate_tokens
+from text_utils import CJK_CHAR_RE
+
+
+CJK_RUN_RE = re.compile(CJK_CHAR_RE.pattern + '+')
+SYLLABLES = ['ka', 'shi', 'ro', 'mei', 'lan', 'tao', 'yu', 'zhen', 'hai', 'lin',
+             'qi', 'feng', 'mu', 'xue', 'an', 'jin', 'po', 'ren', 'su', 'wen']
+
+
+def pseudo_translate(text):
+    """Deterministic fake translation: every CJK run becomes a capitalized pseudo-word"""
+    def word(match):
+        return ''.join(SYLLABLES[ord(char) % len(SYLLABLES)] for char in match.group()).capitalize()
+    text = CJK_RUN_RE.sub(lambda m: ' ' + word(m) + ' ', text)
+    return '\n'.join(' '.join(line.split()) for line in text.split('\n'))
+
+
+class MockResponse:
+    """The subset of requests.Response used by Translator._post_openrouter"""
+    def __init__(self, status_code, payload, headers=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = headers or {}
+        self.text = json.dumps(payload, ensure_ascii=False)
+
+    def json(self):
+        return self.payload
+
+
+class MockOpenRouter:
+    def __init__(self, config):
+        self.seed = config.get('mock_seed', 0)
+        self.latency = config.get('mock_latency', 0.5)  # Median seconds per request
+        self.latency_sigma = config.get('mock_latency_sigma', 0.3)  # Log-normal spread
+        self.latency_per_1k_tokens = config.get('mock_latency_per_1k_tokens', 2.0)  # Generation time
+        self.rate_limit_rate = config.get('mock_rate_limit_rate', 0.0)
+        self.retry_after = config.get('mock_retry_after', 0)
+        self.error_rate = config.get('mock_error_rate', 0.0)
+        self.truncation_rate = config.get('mock_truncation_rate', 0.0)
+        self.max_completion_tokens = config.get('mock_max_completion_tokens', 0)  # 0 = unlimited
+        self.cost_per_1k_tokens = config.get('mock_cost_per_1k_tokens', 0.0)
+        self._seen = Counter()
+        self._lock = threading.Lock()
+
+    def _rng(self, data):
+        digest = hashlib.sha1(json.dumps(data['messages'], ensure_ascii=False).encode('utf-8')).hexdigest()
+        with self._lock:
+            self._seen[digest] += 1
+            occurrence = self._seen[digest]
+        return random.Random(f"{self.seed}:{digest}:{occurrence}")
+
+    def _reply(self, messages):
+        """Reply content for a request: a translation, or a canned answer to the glossary/metadata prompts"""
+        content = messages[-1]['content']
+        if any(m['role'] == 'system' for m in messages):
+            return pseudo_translate(content)
+        if 'Output strictly valid JSON' in content:
+            return json.dumps({'genres': ['Fantasy'], 'tags': ['Mock']})
+        if '\nList:\n' in content:
+            return '\n'.join(content.split('\nList:\n', 1)[1].splitlines()[:40])
+        if '\nText:\n' in content:
+            runs = CJK_RUN_RE.findall(content.split('\nText:\n', 1)[1])
+            bigrams = Counter(run[i:i + 2] for run in runs for i in range(len(run) - 1))
+            return '\n'.join(f"{term}: {pseudo_translate(term)}" for term, _ in bigrams.most_common(5))
+        return pseudo_translate(content)
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        """Drop-in for requests.post against the chat completions endpoint"""
+        data = json.loads(data)
+        rng = self._rng(data)
+        latency = self.latency * rng.lognormvariate(0, self.latency_sigma) if self.latency else 0.0
+
+        if rng.random() < self.rate_limit_rate:
+            time.sleep(latency / 4)
+            headers = {'Retry-After': str(self.retry_after)} if self.retry_after else {}
+            return MockResponse(429, {'error': {'code': 429, 'message': 'Rate limit exceeded (mock)'}}, headers)
+        if rng.random() < self.error_rate:
+            time.sleep(latency)
+            return MockResponse(502, {'error': {'code': 502, 'message': 'Provider error (mock)'}})
+
+        output = self._reply(data['messages'])
+        finish_reason = 'stop'
+        completion_tokens = estimate_tokens(output)
+        # Cut the reply off mid-text, like a model hitting its output limit
+        cut = None
+        if self.max_completion_tokens and completion_tokens > self.max_completion_tokens:
+            cut = len(output) * self.max_completion_tokens // completion_tokens
+        elif rng.random() < self.truncation_rate and any(m['role'] == 'system' for m in data['messages']):
+            cut = int(len(output) * rng.uniform(0.3, 0.9))
+        if cut is not None:
+            output = output[:max(1, cut)]
+            finish_reason = 'length'
+            completion_tokens = estimate_tokens(output)
+
+        prompt_tokens = sum(estimate_tokens(m.get('content', '')) + 4 for m in data['messages'])
+        time.sleep(latency + completion_tokens / 1000 * self.latency_per_1k_tokens)
+        return MockResponse(200, {
+            'id': f"mock-{rng.getrandbits(32):08x}",
+            'model': data.get('model'),
+            'choices': [{'message': {'role': 'assistant', 'content': output}, 'finish_reason': finish_reason}],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+                'cost': (prompt_tokens + completion_tokens) / 1000 * self.cost_per_1k_tokens
+            }
+        })
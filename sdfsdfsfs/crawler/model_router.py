@@ -0,0 +1,111 @@
+"""
+Multi-model routing for OpenRouter requests
+
+Keeps rolling latency / error / rate-limit statistics per model and orders an
+acceptable-model pool so each request goes to the best healthy model, failing
+over to the next one when a model errors, times out or is rate limited.
+"""
+
+import time
+import threading
+from collections import deque
+
+
+class ModelStats:
+    def __init__(self, window):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)  # 'ok', 'error' or 'rate_limited'
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def percentile(self, pct):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def rate(self, outcome):
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for o in self.outcomes if o == outcome) / len(self.outcomes)
+
+
+class ModelRouter:
+    def __init__(self, models, window=50, min_samples=3, cooldown=30, max_cooldown=300):
+        self.models = []
+        self.window = window
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.stats = {}
+        self._lock = threading.Lock()
+        for model in models:
+            self.add_model(model)
+
+    def add_model(self, model):
+        with self._lock:
+            if model and model not in self.stats:
+                self.models.append(model)
+                self.stats[model] = ModelStats(self.window)
+
+    def score(self, model):
+        """Expected cost of a request (median latency inflated by failure rates); None until measured"""
+        stats = self.stats[model]
+        if len(stats.outcomes) < self.min_samples or not stats.latencies:
+            return None
+        penalty = 1 + 4 * stats.rate('error') + 4 * stats.rate('rate_limited')
+        return stats.percentile(50) * penalty
+
+    def candidates(self, preferred=None):
+        """
+        Models in the order they should be tried: healthy models by score (unmeasured
+        ones keep their pool order, after measured ones unless preferred), then models
+        cooling down.
+        """
+        if preferred:
+            self.add_model(preferred)
+        now = time.time()
+        with self._lock:
+            pool = [preferred] + [m for m in self.models if m != preferred] if preferred else list(self.models)
+            healthy = [m for m in pool if self.stats[m].cooldown_until <= now]
+            cooling = sorted((m for m in pool if self.stats[m].cooldown_until > now),
+                             key=lambda m: self.stats[m].cooldown_until)
+            scores = {m: self.score(m) for m in healthy}
+        # An unmeasured preferred model (e.g. a job's override) is tried first to get measured
+        unmeasured = {m: 0 if m == preferred else float('inf') for m in healthy}
+        healthy.sort(key=lambda m: unmeasured[m] if scores[m] is None else scores[m])
+        return healthy + cooling
+
+    def wait_time(self, model):
+        """Seconds until a cooling-down model is usable again"""
+        return max(0.0, self.stats[model].cooldown_until - time.time())
+
+    def record(self, model, latency, outcome):
+        """Record one request; repeated failures put the model on an escalating cooldown"""
+        with self._lock:
+            stats = self.stats[model]
+            stats.outcomes.append(outcome)
+            if outcome == 'ok':
+                stats.latencies.append(latency)
+                stats.consecutive_failures = 0
+                return
+            stats.consecutive_failures += 1
+            # A 429 cools the model down at once; other errors after the second in a row
+            if outcome == 'rate_limited' or stats.consecutive_failures >= 2:
+                delay = min(self.max_cooldown, self.cooldown * 2 ** (stats.consecutive_failures - 1))
+                stats.cooldown_until = time.time() + delay
+
+    def summary(self):
+        """One line per model: p50/p95 latency, error and 429 rates"""
+        lines = []
+        for model in self.models:
+            stats = self.stats[model]
+            if not stats.outcomes:
+                continue
+            p50, p95 = stats.percentile(50), stats.percentile(95)
+            latency = f"p50 {p50:.1f}s p95 {p95:.1f}s" if p50 is not None else "no successes"
+            lines.append(
+                f"{model}: {len(stats.outcomes)} req, {latency}, "
+                f"errors {stats.rate('error'):.0%}, 429s {stats.rate('rate_limited'):.0%}"
+            )
+        return lines
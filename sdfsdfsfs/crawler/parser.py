@@ -19,12 +19,90 @@ try:
 except ImportError:
     UserAgent = None
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree = None
+    lxml_html = None
+
+
+# Tags stripped from chapter content (ads, AMP images, scripts)
+CHAPTER_DROP_TAGS = ('script', 'style', 'amp-img', 'center')
+CHAPTER_AD_DIV_CLASSES = ('mobadsq',)
+CHAPTER_AD_DIV_IDS = ('div_content_end',)
+
+_CLASS_XPATH = "//div[contains(concat(' ', normalize-space(@class), ' '), ' {} ')]"
+
+# Connection-specific headers are not allowed over HTTP/2
+HTTP2_EXCLUDED_HEADERS = ('connection', 'keep-alive', 'transfer-encoding', 'upgrade')
+# Statuses that mean the HTTP/2 client was challenged/blocked (cloudscraper can handle these)
+HTTP2_FALLBACK_STATUSES = (403, 429, 503)
+HTTP2_MAX_FAILURES = 3
+
+
+class Http2Response:
+    """Adapts an httpx response to the subset of the requests API the parser uses"""
+    
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.http_version = response.http_version
+    
+    @property
+    def encoding(self):
+        return self._response.encoding
+    
+    @encoding.setter
+    def encoding(self, value):
+        self._response.encoding = value
+    
+    @property
+    def content(self):
+        return self._response.read()
+    
+    @property
+    def text(self):
+        self._response.read()
+        return self._response.text
+    
+    def json(self):
+        self._response.read()
+        return self._response.json()
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self._response.url}", response=self)
+    
+    def iter_content(self, chunk_size=8192):
+        return self._response.iter_bytes(chunk_size=chunk_size)
+    
+    def close(self):
+        self._response.close()
+
 
 class NovelParser:
-    def __init__(self, logger):
+    def __init__(self, logger, config=None):
         self.logger = logger
+        self.config = config or {}
         self.ua = UserAgent() if UserAgent else None
         
+        # Stream chapter bodies into an incremental parser (stops reading after div.content)
+        self.stream_chapters = self.config.get('stream_chapters', False) and etree is not None
+        
+        # Optional HTTP/2 transport (multiplexes concurrent fetches over a few connections)
+        if getattr(self, 'http2_client', None) is not None:
+            self.http2_client.close()
+        self.http2_client = None
+        self.http2_failures = 0
+        if self.config.get('http2', False):
+            self.http2_client = self._create_http2_client()
+        
         # Initialize session with browser-like behavior
         if cloudscraper:
             try:
@@ -59,6 +137,52 @@ class NovelParser:
         }
         self.session.headers.update(headers)
     
+    def _create_http2_client(self):
+        """Create the httpx HTTP/2 client, or None if httpx/h2 are unavailable"""
+        if not httpx:
+            self.logger("HTTP/2 requested but httpx is not installed - using default transport")
+            return None
+        try:
+            client = httpx.Client(
+                http2=True,
+                timeout=30,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.config.get('http2_max_connections', 4),
+                    max_keepalive_connections=self.config.get('http2_max_connections', 4)
+                )
+            )
+            self.logger("Initialized HTTP/2 client")
+            return client
+        except ImportError as e:
+            # httpx raises ImportError when the h2 package is missing
+            self.logger(f"HTTP/2 unavailable ({e}) - using default transport")
+            return None
+    
+    def _get(self, url, timeout=30, stream=False):
+        """GET through the HTTP/2 client when enabled, falling back to the session"""
+        if self.http2_client is not None:
+            # Same header set as the session (UA, Referer, ...) minus HTTP/1.1-only headers
+            headers = {k: v for k, v in self.session.headers.items() if k.lower() not in HTTP2_EXCLUDED_HEADERS}
+            try:
+                request = self.http2_client.build_request('GET', url, headers=headers, timeout=timeout)
+                response = Http2Response(self.http2_client.send(request, stream=stream))
+                if response.status_code not in HTTP2_FALLBACK_STATUSES:
+                    self.http2_failures = 0
+                    return response
+                response.close()
+                self.logger(f"HTTP/2 request got {response.status_code}, retrying with default transport")
+            except httpx.HTTPError as e:
+                self.logger(f"HTTP/2 request failed ({e}), retrying with default transport")
+            
+            self.http2_failures += 1
+            if self.http2_failures >= HTTP2_MAX_FAILURES:
+                self.logger(f"HTTP/2 failed {self.http2_failures} times in a row - disabling it")
+                self.http2_client.close()
+                self.http2_client = None
+        
+        return self.session.get(url, timeout=timeout, stream=stream)
+    
     def get_random_ua(self):
         if self.ua:
             try:
@@ -85,18 +209,18 @@ class NovelParser:
                     self.logger(f"Retry {attempt}/{max_retries} for novel page...")
                     time.sleep(5)
                 
-                response = self.session.get(url, timeout=30)
+                response = self._get(url, timeout=30)
                 response.raise_for_status()
                 break # Success
             except Exception as e:
                 self.logger(f"Request failed: {e}. Retrying with new session...")
                 # Re-init session on failure
-                self.__init__(self.logger)
+                self.__init__(self.logger, self.config)
                 time.sleep(5)
                 # Last attempt try again
                 if attempt == max_retries - 1:
                     try:
-                       response = self.session.get(url, timeout=30)
+                       response = self._get(url, timeout=30)
                     except:
                        pass
 
@@ -158,10 +282,17 @@ class NovelParser:
             novel_data['description'] = description_div.get_text(separator='\n', strip=True)
 
         # Fetch chapters from API
+        novel_data['chapters'] = self.fetch_chapter_list(novel_id)
+        
+        return novel_data, novel_id
+    
+    def fetch_chapter_list(self, novel_id):
+        """Fetch only the chapter list for a novel (one small API request)"""
         # API URL: https://www.ttkan.co/api/nq/amp_novel_chapters?language=tw&novel_id={novel_id}
         api_url = f"https://www.ttkan.co/api/nq/amp_novel_chapters?language=tw&novel_id={novel_id}"
+        chapters = []
         try:
-            api_response = self.session.get(api_url)
+            api_response = self._get(api_url, timeout=30)
             if api_response.status_code == 200:
                 chapters_json = api_response.json()
                 items = chapters_json.get('items', [])
@@ -172,7 +303,7 @@ class NovelParser:
                     # Using page_direct format as seen in the site
                     chapter_url = f"https://www.ttkan.co/novel/user/page_direct?novel_id={novel_id}&page={chapter_id}"
                     
-                    novel_data['chapters'].append({
+                    chapters.append({
                         'title': chapter_name,
                         'url': chapter_url,
                         'chapter_number': chapter_id
@@ -180,7 +311,7 @@ class NovelParser:
         except Exception as e:
             self.logger(f"Error fetching chapters from API: {e}")
         
-        return novel_data, novel_id
+        return chapters
     
     def parse_category_page(self, url):
         """Parse category page to extract novel URLs"""
@@ -273,8 +404,12 @@ class NovelParser:
                 if attempt > 0:
                     time.sleep(random.uniform(2, 5))
                 
-                response = self.session.get(url, timeout=30)
+                response = self._get(url, timeout=30, stream=self.stream_chapters)
                 response.raise_for_status()
+                if self.stream_chapters:
+                    # The body is read here, so a connection dropped mid-body is retried as well
+                    response.encoding = 'utf-8'
+                    return self._extract_chapter_content_streaming(response)
                 break
             except Exception as e:
                 if attempt < max_retries - 1:
@@ -320,7 +455,134 @@ class NovelParser:
              return None, None
 
         response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.content, 'lxml')
+        return self.extract_chapter_content(response.content)
+    
+    def _extract_chapter_content_streaming(self, response):
+        """
+        Feed response chunks into an incremental parser and stop reading as soon
+        as div.content has closed. The rest of the page is never downloaded or parsed.
+        """
+        pull_parser = etree.HTMLPullParser(events=('start', 'end'), encoding='utf-8')
+        content_div = None
+        content_closed = False
+        
+        try:
+            for chunk in response.iter_content(chunk_size=8192):
+                pull_parser.feed(chunk)
+                for event, element in pull_parser.read_events():
+                    if event == 'start':
+                        if content_div is None and element.tag == 'div' and 'content' in (element.get('class') or '').split():
+                            content_div = element
+                    elif element is content_div:
+                        content_closed = True
+                        break
+                if content_closed:
+                    break
+        finally:
+            # Drop the connection instead of draining the unread remainder
+            response.close()
+        
+        try:
+            root = pull_parser.close()
+        except etree.LxmlError:
+            # Empty body
+            return None, None
+        
+        return self._extract_chapter_content_tree(root)
+    
+    def extract_chapter_content(self, html_content):
+        """Extract (title, content) from chapter page HTML (fast lxml path, BeautifulSoup fallback)"""
+        if lxml_html is not None:
+            try:
+                return self._extract_chapter_content_lxml(html_content)
+            except (etree.ParserError, ValueError):
+                # Empty or undecodable document - let BeautifulSoup have a go
+                pass
+        return self._extract_chapter_content_soup(html_content)
+    
+    def _extract_chapter_content_lxml(self, html_content):
+        """
+        Fast path: libxml2 builds the tree in C and only the div.title / div.content
+        subtrees are visited from Python, dropping ad nodes in the same pass.
+        Produces exactly the same output as _extract_chapter_content_soup.
+        """
+        if isinstance(html_content, str):
+            html_content = html_content.encode('utf-8')
+        root = lxml_html.document_fromstring(html_content, parser=lxml_html.HTMLParser(encoding='utf-8'))
+        return self._extract_chapter_content_tree(root)
+    
+    def _extract_chapter_content_tree(self, root):
+        """Extract (title, content) from an already parsed lxml tree"""
+        # Extract chapter title
+        title = ''
+        title_divs = root.xpath(_CLASS_XPATH.format('title'))
+        if title_divs:
+            h1 = next(title_divs[0].iter('h1'), None)
+            if h1 is not None:
+                title = ''.join(self._collect_paragraphs(h1, match_tag='h1')[0])
+        
+        # Extract chapter content
+        content_divs = root.xpath(_CLASS_XPATH.format('content'))
+        if not content_divs:
+            return None, None
+        
+        lines = []
+        for fragments in self._collect_paragraphs(content_divs[0], match_tag='p', drop_ads=True):
+            text = ''.join(fragments)
+            if text:
+                lines.append(text)
+        
+        content = '\n\n'.join(lines)
+        
+        return title, content
+    
+    @staticmethod
+    def _is_chapter_ad(element):
+        """Check whether an element is stripped from chapter content"""
+        tag = element.tag
+        if tag in CHAPTER_DROP_TAGS:
+            return True
+        if tag == 'div':
+            classes = (element.get('class') or '').split()
+            if any(cls in classes for cls in CHAPTER_AD_DIV_CLASSES):
+                return True
+            if element.get('id') in CHAPTER_AD_DIV_IDS:
+                return True
+        return False
+    
+    def _collect_paragraphs(self, element, match_tag, drop_ads=False):
+        """
+        Single pass over a subtree collecting stripped text fragments for every
+        `match_tag` element (including `element` itself), in document order.
+        Mirrors BeautifulSoup's get_text(strip=True): comments are ignored and
+        removed nodes keep their tail text.
+        """
+        paragraphs = []
+        
+        def add_text(text, open_paragraphs):
+            if text and open_paragraphs:
+                text = text.strip()
+                if text:
+                    for fragments in open_paragraphs:
+                        fragments.append(text)
+        
+        def walk(node, open_paragraphs):
+            if node.tag == match_tag:
+                fragments = []
+                paragraphs.append(fragments)
+                open_paragraphs = open_paragraphs + [fragments]
+            add_text(node.text, open_paragraphs)
+            for child in node:
+                if isinstance(child.tag, str) and not (drop_ads and self._is_chapter_ad(child)):
+                    walk(child, open_paragraphs)
+                add_text(child.tail, open_paragraphs)
+        
+        walk(element, [])
+        return paragraphs
+    
+    def _extract_chapter_content_soup(self, html_content):
+        """Reference implementation using a full BeautifulSoup tree"""
+        soup = BeautifulSoup(html_content, 'lxml')
         
         # Extract chapter title
         title_div = soup.find('div', class_='title')
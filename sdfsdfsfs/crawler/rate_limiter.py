@@ -0,0 +1,100 @@
+"""
+Client-side request / token budget for LLM calls
+
+A sliding 60-second window of admitted requests and their token cost. Callers
+block in acquire() until the request fits under both the requests-per-minute
+and tokens-per-minute limits, so we run at the provider's limit instead of
+hitting it and backing off after 429s. Budgets are shared per key, so every
+Translator method and every job in the process draws from the same one.
+"""
+
+import time
+import threading
+from collections import deque
+from text_utils import CJK_CHAR_RE
+
+
+_budgets = {}
+_budgets_lock = threading.Lock()
+
+
+def estimate_tokens(text):
+    """Rough token count: ~1 token per CJK character, ~4 characters per token otherwise"""
+    if not text:
+        return 0
+    cjk = len(CJK_CHAR_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def estimate_request_tokens(messages):
+    """Prompt tokens plus an expected completion about the size of the user content"""
+    prompt = sum(estimate_tokens(m.get('content', '')) + 4 for m in messages)
+    completion = sum(estimate_tokens(m.get('content', '')) for m in messages if m.get('role') == 'user')
+    return prompt + completion
+
+
+def shared_budget(key, rpm=0, tpm=0):
+    """The process-wide budget for a key (e.g. an API key); limits of 0 mean unlimited"""
+    with _budgets_lock:
+        budget = _budgets.get(key)
+        if budget is None:
+            budget = _budgets[key] = RateBudget(rpm, tpm)
+        else:
+            budget.rpm, budget.tpm = rpm, tpm
+        return budget
+
+
+class RateBudget:
+    def __init__(self, rpm=0, tpm=0, window=60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self.entries = deque()  # [admitted_at, tokens]
+        self.paused_until = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def enabled(self):
+        return bool(self.rpm or self.tpm)
+
+    def _wait_time(self, tokens, now):
+        while self.entries and self.entries[0][0] <= now - self.window:
+            self.entries.popleft()
+
+        if self.paused_until > now:
+            return self.paused_until - now
+        if self.rpm and len(self.entries) >= self.rpm:
+            return self.entries[0][0] + self.window - now
+        if self.tpm and self.entries:
+            used = sum(entry[1] for entry in self.entries)
+            if used + tokens > self.tpm:
+                # Wait until enough of the oldest requests have left the window
+                for admitted_at, cost in self.entries:
+                    used -= cost
+                    if used + tokens <= self.tpm:
+                        break
+                return admitted_at + self.window - now
+        return 0
+
+    def acquire(self, tokens):
+        """Block until a request of `tokens` fits the budget; returns its entry for settle()"""
+        with self._cond:
+            while True:
+                now = time.time()
+                wait = self._wait_time(tokens, now)
+                if wait <= 0:
+                    entry = [now, tokens]
+                    self.entries.append(entry)
+                    return entry
+                self._cond.wait(wait)
+
+    def settle(self, entry, tokens):
+        """Replace a request's estimated cost with the actual usage reported by the API"""
+        with self._cond:
+            entry[1] = tokens
+            self._cond.notify_all()
+
+    def pause(self, seconds):
+        """Admit nothing for `seconds` (e.g. a Retry-After from the provider)"""
+        with self._cond:
+            self.paused_until = max(self.paused_until, time.time() + seconds)
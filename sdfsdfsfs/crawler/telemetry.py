@@ -0,0 +1,154 @@
+"""
+Translation telemetry: structured per-call records aggregated per chapter and job
+
+Every LLM / translation call is written as one JSON line (model, prompt and
+completion tokens, cost, latency, retries) and rolled up, together with chunk
+counts and cache hits, into chapter and job totals, which are also written to
+the JSONL file and summarized in the log.
+"""
+
+import os
+import json
+import time
+import threading
+
+
+COUNTERS = ('calls', 'prompt_tokens', 'completion_tokens', 'cost', 'latency', 'retries', 'chunks', 'cache_hits', 'errors')
+
+
+def _empty_totals():
+    return {name: 0 for name in COUNTERS}
+
+
+def _rounded(totals):
+    return {name: round(value, 6) if isinstance(value, float) else value for name, value in totals.items()}
+
+
+class Telemetry:
+    def __init__(self, path=os.path.join('logs', 'translation_telemetry.jsonl')):
+        self.path = path
+        self.job = None
+        self.job_totals = _empty_totals()
+        self.job_started = time.time()
+        self.models = {}
+        self._chapters = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _write(self, record):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def _add(self, totals, values):
+        for name, value in values.items():
+            if name in totals and value:
+                totals[name] += value
+
+    def start_job(self, job):
+        """Reset the aggregates for a new job / novel run"""
+        with self._lock:
+            self.job = job
+            self.job_totals = _empty_totals()
+            self.job_started = time.time()
+            self.models = {}
+            self._chapters = {}
+        self._local.chapter = None
+
+    def set_chapter(self, chapter):
+        """Attribute this thread's following calls to a chapter (closes the previous one)"""
+        self.end_chapter()
+        self._local.chapter = chapter
+        with self._lock:
+            self._chapters[chapter] = _empty_totals()
+
+    def end_chapter(self):
+        chapter = getattr(self._local, 'chapter', None)
+        if chapter is None:
+            return
+        self._local.chapter = None
+        with self._lock:
+            totals = self._chapters.pop(chapter, None)
+            if totals:
+                self._write({'type': 'chapter', 'ts': time.time(), 'job': self.job, 'chapter': chapter, **_rounded(totals)})
+
+    def bind(self, func):
+        """Wrap func so a worker thread attributes its calls to the caller's current chapter"""
+        chapter = getattr(self._local, 'chapter', None)
+        
+        def bound(*args, **kwargs):
+            self._local.chapter = chapter
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.chapter = None
+        return bound
+
+    def record_call(self, kind, model=None, usage=None, latency=0.0, retries=0, status='ok'):
+        """One backend request; usage is the OpenRouter usage block (if any)"""
+        usage = usage or {}
+        values = {
+            'calls': 1,
+            'prompt_tokens': usage.get('prompt_tokens') or 0,
+            'completion_tokens': usage.get('completion_tokens') or 0,
+            'cost': usage.get('cost') or 0,
+            'latency': latency,
+            'retries': retries,
+            'errors': 0 if status == 'ok' else 1
+        }
+        chapter = getattr(self._local, 'chapter', None)
+        with self._lock:
+            self._add(self.job_totals, values)
+            self._add(self.models.setdefault(model or kind, _empty_totals()), values)
+            if chapter in self._chapters:
+                self._add(self._chapters[chapter], values)
+            self._write({
+                'type': 'call', 'ts': time.time(), 'job': self.job, 'chapter': chapter,
+                'kind': kind, 'model': model, 'status': status,
+                'prompt_tokens': values['prompt_tokens'], 'completion_tokens': values['completion_tokens'],
+                'cost': values['cost'], 'latency': round(latency, 3), 'retries': retries
+            })
+
+    def record_chunks(self, count):
+        """Number of chunks a chapter text was split into"""
+        chapter = getattr(self._local, 'chapter', None)
+        with self._lock:
+            self.job_totals['chunks'] += count
+            if chapter in self._chapters:
+                self._chapters[chapter]['chunks'] += count
+
+    def record_cache_hit(self, count=1):
+        """Translations served from a cache (chapter manifest, translation memory) instead of the backend"""
+        chapter = getattr(self._local, 'chapter', None)
+        with self._lock:
+            self.job_totals['cache_hits'] += count
+            if chapter in self._chapters:
+                self._chapters[chapter]['cache_hits'] += count
+
+    def end_job(self):
+        """Close the job: write its totals and return summary lines for the log"""
+        self.end_chapter()
+        with self._lock:
+            totals = dict(self.job_totals)
+            elapsed = time.time() - self.job_started
+            self._write({'type': 'job', 'ts': time.time(), 'job': self.job, 'elapsed': round(elapsed, 1),
+                         'models': {model: _rounded(t) for model, t in self.models.items()}, **_rounded(totals)})
+            models = dict(self.models)
+
+        lines = [
+            f"Translation telemetry: {totals['calls']} calls, "
+            f"{totals['prompt_tokens']} prompt + {totals['completion_tokens']} completion tokens, "
+            f"cost {totals['cost']:.4f}, {totals['latency']:.1f}s in calls, "
+            f"{totals['retries']} retries, {totals['errors']} errors, {totals['cache_hits']} cache hits, "
+            f"{totals['chunks']} chunks ({elapsed:.0f}s total)"
+        ]
+        for model, model_totals in models.items():
+            calls = model_totals['calls'] or 1
+            lines.append(
+                f"  {model}: {model_totals['calls']} calls, "
+                f"{model_totals['prompt_tokens'] + model_totals['completion_tokens']} tokens, "
+                f"avg {model_totals['latency'] / calls:.1f}s"
+            )
+        return lines
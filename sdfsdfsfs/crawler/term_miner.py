@@ -0,0 +1,121 @@
+"""
+Local candidate-term mining for glossary mode
+
+Counts recurring CJK n-grams per novel, incrementally across batches, so the LLM
+glossary extraction only runs when enough new high-frequency candidates show up,
+and only on the sentences that contain them.
+"""
+
+import re
+
+
+CJK_RUN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff]{2,}')
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[。！？!?…])|\n')
+TAG_RE = re.compile(r'<[^>]+>')
+
+# Function words / particles that almost never appear inside a name or term,
+# in simplified and traditional forms (ttkan serves traditional Chinese)
+STOP_CHARS = set(
+    '的了是在我你他她它们这那有不也就都而及与着被把说道之个来去上下中和吗呢吧啊么人一为对于将过还没'
+    '們這與著說個來嗎麼為對於將過還沒'
+)
+
+
+class TermMiner:
+    def __init__(self, min_count=3, min_candidates=3, ngram_sizes=(2, 3, 4), max_entries=200000):
+        self.min_count = min_count
+        self.min_candidates = min_candidates
+        self.ngram_sizes = ngram_sizes
+        self.max_entries = max_entries
+        self.counts = {}
+        self.chapters = set()   # Chapter keys already counted (resume-safe)
+        self.submitted = set()  # Candidates already sent to the LLM
+        self.cjk_chars = 0
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        miner = cls(**kwargs)
+        if data:
+            miner.counts = dict(data.get('counts', {}))
+            miner.chapters = set(data.get('chapters', []))
+            miner.submitted = set(data.get('submitted', []))
+            miner.cjk_chars = data.get('cjk_chars', 0)
+        return miner
+
+    def to_dict(self):
+        # Copies: the stats are serialized by the write-behind flush while mining continues
+        return {
+            'counts': dict(self.counts),
+            'chapters': sorted(self.chapters),
+            'submitted': sorted(self.submitted),
+            'cjk_chars': self.cjk_chars
+        }
+
+    def add_chapter(self, chapter_key, text):
+        """Count the n-grams of one chapter (once per chapter key); returns CJK chars seen"""
+        chapter_key = str(chapter_key)
+        if chapter_key in self.chapters:
+            return 0
+        self.chapters.add(chapter_key)
+
+        seen = 0
+        for run in CJK_RUN_RE.findall(text or ''):
+            seen += len(run)
+            for size in self.ngram_sizes:
+                for i in range(len(run) - size + 1):
+                    gram = run[i:i + size]
+                    if gram[0] in STOP_CHARS or gram[-1] in STOP_CHARS:
+                        continue
+                    self.counts[gram] = self.counts.get(gram, 0) + 1
+        self.cjk_chars += seen
+
+        if len(self.counts) > self.max_entries:
+            # Drop one-off n-grams to keep the per-novel stats bounded
+            self.counts = {gram: count for gram, count in self.counts.items() if count > 1}
+        return seen
+
+    def new_candidates(self, glossary, limit=30):
+        """Frequent n-grams not covered by the glossary or an earlier LLM call, most frequent first"""
+        known = [item['original'] for item in glossary or [] if item.get('original')]
+        frequent = {gram: count for gram, count in self.counts.items() if count >= self.min_count}
+
+        # Highest count of a longer n-gram extending each gram by one character
+        extended = {}
+        for gram, count in frequent.items():
+            for part in (gram[1:], gram[:-1]):
+                if count > extended.get(part, 0):
+                    extended[part] = count
+
+        candidates = []
+        for gram, count in frequent.items():
+            if gram in self.submitted or any(gram in term or term in gram for term in known):
+                continue
+            if gram[0] in STOP_CHARS or gram[-1] in STOP_CHARS:
+                continue  # Counted by a version with fewer stop characters
+            if extended.get(gram, 0) >= 0.8 * count:
+                continue  # Fragment of a longer term (e.g. two characters of a three-character name)
+            candidates.append((count, gram))
+
+        candidates.sort(reverse=True)
+        return [gram for _, gram in candidates[:limit]]
+
+    def should_extract(self, candidates):
+        return len(candidates) >= self.min_candidates
+
+    def mark_submitted(self, candidates):
+        self.submitted.update(candidates)
+
+    @staticmethod
+    def context_for(text, candidates, max_chars=6000):
+        """Only the sentences of text that mention a candidate, up to max_chars"""
+        sentences = []
+        length = 0
+        for sentence in SENTENCE_SPLIT_RE.split(TAG_RE.sub('\n', text or '')):
+            sentence = sentence.strip()
+            if not sentence or not any(gram in sentence for gram in candidates):
+                continue
+            if length + len(sentence) > max_chars:
+                break
+            sentences.append(sentence)
+            length += len(sentence) + 1
+        return '\n'.join(sentences)
@@ -0,0 +1,27 @@
+"""Tests for cross-chapter boilerplate detection (run with: python -m pytest test_boilerplate.py)"""
+
+from boilerplate import BoilerplateIndex
+
+
+def chapter(number):
+    return '\n\n'.join([
+        '本站網址：ttkan.co，請收藏。',
+        f'第{number}章的開頭。',
+        '「好。」',
+        f'林動說完第{number}句話。',
+        '「嗯。」',
+        f'第{number}章的結尾。',
+        '求推薦票，求收藏！',
+    ])
+
+
+def test_repeated_short_dialogue_in_the_body_is_kept():
+    index = BoilerplateIndex(min_chapters=5)
+    for number in range(1, 9):
+        index.add_chapter(number, chapter(number))
+
+    leading, body, trailing = index.split(chapter(9))
+
+    assert leading == ['本站網址：ttkan.co，請收藏。']
+    assert trailing == ['求推薦票，求收藏！']
+    assert body.split('\n\n') == ['第9章的開頭。', '「好。」', '林動說完第9句話。', '「嗯。」', '第9章的結尾。']
@@ -0,0 +1,36 @@
+"""Tests for the glossary candidate mining (run with: python -m pytest test_term_miner.py)"""
+
+from term_miner import TermMiner, STOP_CHARS
+
+
+TRADITIONAL_CHAPTER = (
+    '<p>1、歸零</p>\n'
+    '<p>林動說：「這個東西還沒有交給他們。」</p>\n'
+    '<p>林動對於這個結果很滿意，他們將會過來嗎？</p>\n'
+    '<p>林動與蕭炎說過，為了這個青檀，他們來了。</p>\n'
+    '<p>蕭炎說：「這個青檀還沒到麼？」</p>\n'
+)
+
+
+def test_traditional_particles_are_stop_chars():
+    for char in '們這個說來嗎麼與為對於將過還沒':
+        assert char in STOP_CHARS
+
+
+def test_traditional_particles_are_not_candidates():
+    miner = TermMiner(min_count=2, min_candidates=1)
+    for chapter in range(3):
+        miner.add_chapter(chapter, TRADITIONAL_CHAPTER)
+    candidates = miner.new_candidates([])
+
+    assert '林動' in candidates
+    assert '蕭炎' in candidates
+    assert '青檀' in candidates
+    for gram in candidates:
+        assert gram[0] not in STOP_CHARS and gram[-1] not in STOP_CHARS, gram
+
+
+def test_stale_stop_char_counts_are_not_candidates():
+    # Stats saved before a character became a stop character still hold its n-grams
+    miner = TermMiner.from_dict({'counts': {'這個': 9, '林動': 5}}, min_count=3)
+    assert miner.new_candidates([]) == ['林動']
@@ -0,0 +1,145 @@
+"""
+Small text helpers shared by the translation pipeline
+"""
+
+import re
+import html
+
+
+CJK_CHAR_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]')
+NON_SPACE_RE = re.compile(r'\S')
+CJK_LANGUAGES = ('zh', 'ja', 'ko')
+
+
+def is_cjk_language(code):
+    return bool(code) and code.lower().split('-')[0] in CJK_LANGUAGES
+
+
+def cjk_ratio(text):
+    """Share of non-whitespace characters that are CJK (0.0 for empty text)"""
+    total = len(NON_SPACE_RE.findall(text or ''))
+    if not total:
+        return 0.0
+    return len(CJK_CHAR_RE.findall(text)) / total
+
+
+def split_paragraphs(text):
+    """Non-empty paragraphs of chapter text (paragraphs are separated by blank lines)"""
+    return [p.strip() for p in re.split(r'\n\s*\n', text or '') if p.strip()]
+
+
+def join_paragraphs(paragraphs):
+    return '\n\n'.join(paragraphs)
+
+
+def chunk_paragraphs(paragraphs, max_chars):
+    """Group consecutive paragraphs into chunks of at most max_chars (a longer paragraph is its own chunk)"""
+    chunks = []
+    current = []
+    current_length = 0
+    for para in paragraphs:
+        if current_length + len(para) > max_chars and current:
+            chunks.append(current)
+            current = [para]
+            current_length = len(para)
+        else:
+            current.append(para)
+            current_length += len(para)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# Offline script detection (Unicode ranges only, no network)
+SCRIPT_RES = {
+    'kana': re.compile(r'[\u3040-\u30ff\u31f0-\u31ff\uff66-\uff9f]'),
+    'hangul': re.compile(r'[\u1100-\u11ff\u3130-\u318f\uac00-\ud7af]'),
+    'han': re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]'),
+    'latin': re.compile(r'[A-Za-z\u00c0-\u024f]'),
+    'cyrillic': re.compile(r'[\u0400-\u04ff]'),
+    'greek': re.compile(r'[\u0370-\u03ff]'),
+    'arabic': re.compile(r'[\u0600-\u06ff\u0750-\u077f]'),
+    'devanagari': re.compile(r'[\u0900-\u097f]'),
+    'thai': re.compile(r'[\u0e00-\u0e7f]'),
+}
+
+LANGUAGE_SCRIPTS = {
+    'zh': 'han', 'ja': 'japanese', 'ko': 'hangul',
+    'ru': 'cyrillic', 'uk': 'cyrillic', 'bg': 'cyrillic', 'sr': 'cyrillic',
+    'el': 'greek', 'ar': 'arabic', 'fa': 'arabic', 'ur': 'arabic',
+    'hi': 'devanagari', 'mr': 'devanagari', 'ne': 'devanagari', 'th': 'thai',
+}
+SCRIPT_LANGUAGES = {'han': 'zh-CN', 'japanese': 'ja', 'hangul': 'ko', 'cyrillic': 'ru', 'greek': 'el',
+                    'arabic': 'ar', 'devanagari': 'hi', 'thai': 'th'}
+TAG_RE = re.compile(r'<[^>]*>')
+
+
+def visible_text(text):
+    """Text with HTML tags removed and entities decoded (markup is not language)"""
+    if not text or ('<' not in text and '&' not in text):
+        return text or ''
+    return html.unescape(TAG_RE.sub(' ', text))
+
+
+def script_counts(text):
+    """Letter counts per script of the visible text; Japanese (kana with kanji) is reported as 'japanese'"""
+    text = visible_text(text)
+    counts = {script: len(pattern.findall(text)) for script, pattern in SCRIPT_RES.items()}
+    kana = counts.pop('kana')
+    if kana:
+        counts['japanese'] = kana + counts.pop('han')
+    return {script: count for script, count in counts.items() if count}
+
+
+def language_script(code):
+    """Script a language code is written in ('latin' for anything not listed)"""
+    return LANGUAGE_SCRIPTS.get((code or '').lower().split('-')[0], 'latin')
+
+
+def detect_language(text):
+    """Best-guess language code from the dominant script, or None for text without letters"""
+    counts = script_counts(text)
+    if not counts:
+        return None
+    script = max(counts, key=counts.get)
+    return SCRIPT_LANGUAGES.get(script, 'en' if script == 'latin' else None)
+
+
+def is_in_language(text, code, threshold=0.9):
+    """True if at least `threshold` of the letters are in the language's script; None without letters"""
+    counts = script_counts(text)
+    total = sum(counts.values())
+    if not total:
+        return None
+    return counts.get(language_script(code), 0) / total >= threshold
+
+
+def language_runs(paragraphs, target_lang, min_run=3):
+    """
+    Group paragraphs into runs of (needs_translation, [paragraphs]). Paragraphs without
+    letters join the current run, and target-language runs shorter than min_run
+    paragraphs are folded into the surrounding text so a chapter is not cut into
+    many small requests.
+    """
+    runs = []
+    for para in paragraphs:
+        in_target = is_in_language(para, target_lang)
+        if in_target is None:
+            needs_translation = runs[-1][0] if runs else False
+        else:
+            needs_translation = not in_target
+        if runs and runs[-1][0] == needs_translation:
+            runs[-1][1].append(para)
+        else:
+            runs.append((needs_translation, [para]))
+
+    merged = []
+    for i, (needs_translation, paras) in enumerate(runs):
+        is_edge = i == 0 or i == len(runs) - 1
+        if not needs_translation and len(paras) < min_run and not is_edge:
+            needs_translation = True
+        if merged and merged[-1][0] == needs_translation:
+            merged[-1][1].extend(paras)
+        else:
+            merged.append((needs_translation, list(paras)))
+    return merged
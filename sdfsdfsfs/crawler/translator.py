@@ -2,9 +2,21 @@
 Translation module using googletrans-py (free Google Translate API) or OpenRouter
 """
 
+import os
+import re
 import json
 import requests
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from model_router import ModelRouter
+from rate_limiter import shared_budget, estimate_request_tokens
+from telemetry import Telemetry
+from mock_backend import MockOpenRouter
+from text_utils import (
+    cjk_ratio, is_cjk_language, split_paragraphs, join_paragraphs, chunk_paragraphs,
+    detect_language, language_runs, language_script
+)
 
 try:
     from googletrans import Translator as GoogletransTranslator
@@ -24,6 +36,37 @@ class Translator:
         self.openrouter_api_key = config.get('openrouter_api_key')
         self.openrouter_model = config.get('openrouter_model', 'google/gemini-2.5-flash-lite')
         
+        # Acceptable models, best first; requests go to the best healthy one (see model_router.py)
+        self.router = ModelRouter([self.openrouter_model] + list(config.get('openrouter_models', [])))
+        
+        # Requests/tokens per minute shared by every call (and job) using this API key; 0 = unlimited
+        self.budget = shared_budget(
+            self.openrouter_api_key or 'openrouter',
+            rpm=config.get('openrouter_rpm', 0),
+            tpm=config.get('openrouter_tpm', 0)
+        )
+        
+        # OpenRouter chapter text is sent in paragraph chunks and checked for untranslated residue
+        self.openrouter_chunk_chars = config.get('openrouter_chunk_chars', 6000)
+        self.residue_threshold = config.get('translation_residue_threshold', 0.2)
+        
+        # Per-call tokens/latency/retries, aggregated per chapter and job (JSONL; '' = log summary only)
+        self.telemetry = Telemetry(config.get('telemetry_file', os.path.join('logs', 'translation_telemetry.jsonl')))
+        
+        # googletrans: chunks of one text are translated in parallel, one client per worker thread
+        self.googletrans_workers = config.get('googletrans_workers', 4)
+        self.googletrans_retries = config.get('googletrans_retries', 3)
+        self._local = threading.local()
+        self.mock = None
+        
+        if self.service_type == 'mock':
+            # Offline OpenRouter stand-in for benchmarks: the whole OpenRouter path runs, only the HTTP call is simulated
+            self.mock = MockOpenRouter(config)
+            self.service = 'openrouter'
+            self.client = True
+            self.logger(f"Translator Initialized with mock backend (seed {self.mock.seed}, no network)")
+            return
+        
         if self.service_type == 'openrouter':
             if not self.openrouter_api_key:
                 self.logger("ERROR: OpenRouter API key not found in config")
@@ -36,6 +79,7 @@ class Translator:
         if GOOGLETRANS_AVAILABLE:
             try:
                 self.client = GoogletransTranslator()
+                self._local.client = self.client
                 self.service = 'googletrans'
                 self.logger("Using googletrans-py (free Google Translate API)")
                 return
@@ -71,96 +115,52 @@ Ignore these existing terms: {existing_terms_str}
 Text:
 {text}"""
 
-        headers = {
-            "Authorization": f"Bearer {self.openrouter_api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/your-repo-link", 
-            "X-Title": "NovelCrawler" 
-        }
-        
-        data = {
-            "model": self.openrouter_model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
-        }
+        try:
+            result = self._post_openrouter([{"role": "user", "content": prompt}], kind='glossary')
+            content = result['choices'][0]['message']['content'].strip()
+        except Exception as e:
+            # Soft fail: keep the existing glossary so the job can continue
+            self.logger(f"Glossary extraction failed: {e}")
+            return existing_glossary
         
-        # Retry logic for API calls
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    data=json.dumps(data),
-                    timeout=60
-                )
+        # Parse Text Output (Line by Line)
+        new_terms = []
+        lines = content.split('\n')
+        for line in lines:
+            line = line.strip()
+            if ':' in line:
+                parts = line.split(':', 1)
+                original = parts[0].strip()
+                translation = parts[1].strip()
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    if 'choices' in result and len(result['choices']) > 0:
-                        content = result['choices'][0]['message']['content'].strip()
-                        
-                        # Parse Text Output (Line by Line)
-                        new_terms = []
-                        lines = content.split('\n')
-                        for line in lines:
-                            line = line.strip()
-                            if ':' in line:
-                                parts = line.split(':', 1)
-                                original = parts[0].strip()
-                                translation = parts[1].strip()
-                                
-                                # Basic cleanup
-                                original = original.replace('*', '').replace('-', '').strip()
-                                translation = translation.replace('*', '').strip()
-                                
-                                if original and translation:
-                                    new_terms.append({
-                                        'original': original,
-                                        'translation': translation,
-                                        'type': 'term' # Default type
-                                    })
-                        
-                        # Merge with existing glossary
-                        filtered_new = []
-                        existing_originals = {item['original'] for item in existing_glossary}
-                        
-                        for term in new_terms:
-                            if term['original'] not in existing_originals:
-                                existing_glossary.append(term)
-                                existing_originals.add(term['original'])
-                                filtered_new.append(term)
-                        
-                        self.logger(f"  Glossary updated: +{len(filtered_new)} terms")
-                        
-                        # Auto-Prune if too large (Safety mechanism against token explosion)
-                        if len(existing_glossary) > 60:
-                             self.logger("  Glossary too large (>60). Pruning minor terms...")
-                             return self.prune_glossary(existing_glossary)
-
-                        return existing_glossary
-                    else:
-                        raise Exception(f"Invalid response: {result}")
-                elif response.status_code == 401:
-                    self.logger(f"CRITICAL ERROR: OpenRouter Authorization Failed (401).")
-                    raise Exception(f"OpenRouter Auth Error: {response.text}")
-                elif response.status_code == 429:
-                    wait_time = 5 * (attempt + 1)
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise Exception(f"OpenRouter API error: {response.status_code}")
-                    
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    # Return existing validation on failure instead of crashing?
-                    # User wanted strict, but for glossary maybe soft fail is better than loop crash?
-                    # But crawler.py catches it. Let's log and return existing to keep going.
-                    self.logger(f"Glossary extraction failed: {e}")
-                    return existing_glossary
-                time.sleep(2)
+                # Basic cleanup
+                original = original.replace('*', '').replace('-', '').strip()
+                translation = translation.replace('*', '').strip()
+                
+                if original and translation:
+                    new_terms.append({
+                        'original': original,
+                        'translation': translation,
+                        'type': 'term' # Default type
+                    })
+        
+        # Merge with existing glossary
+        filtered_new = []
+        existing_originals = {item['original'] for item in existing_glossary}
+        
+        for term in new_terms:
+            if term['original'] not in existing_originals:
+                existing_glossary.append(term)
+                existing_originals.add(term['original'])
+                filtered_new.append(term)
         
+        self.logger(f"  Glossary updated: +{len(filtered_new)} terms")
+        
+        # Auto-Prune if too large (Safety mechanism against token explosion)
+        if len(existing_glossary) > 60:
+             self.logger("  Glossary too large (>60). Pruning minor terms...")
+             return self.prune_glossary(existing_glossary)
+
         return existing_glossary
 
     def prune_glossary(self, glossary):
@@ -178,60 +178,140 @@ Original: Translation
 List:
 {glossary_text}"""
 
-        headers = {
-            "Authorization": f"Bearer {self.openrouter_api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/your-repo-link", 
-            "X-Title": "NovelCrawler" 
-        }
-        
-        data = {
-            "model": self.openrouter_model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
-        }
-        
         try:
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                data=json.dumps(data),
-                timeout=60
-            )
+            result = self._post_openrouter([{"role": "user", "content": prompt}], kind='prune')
+            content = result['choices'][0]['message']['content'].strip()
             
-            if response.status_code == 200:
-                result = response.json()
-                if 'choices' in result and len(result['choices']) > 0:
-                    content = result['choices'][0]['message']['content'].strip()
-                    
-                    new_glossary = []
-                    lines = content.split('\n')
-                    for line in lines:
-                        if ':' in line:
-                            parts = line.split(':', 1)
-                            new_glossary.append({
-                                'original': parts[0].strip(),
-                                'translation': parts[1].strip(),
-                                'type': 'term'
-                            })
-                    
-                    self.logger(f"  Glossary Pruned: {len(glossary)} -> {len(new_glossary)} terms")
-                    return new_glossary
+            new_glossary = []
+            lines = content.split('\n')
+            for line in lines:
+                if ':' in line:
+                    parts = line.split(':', 1)
+                    new_glossary.append({
+                        'original': parts[0].strip(),
+                        'translation': parts[1].strip(),
+                        'type': 'term'
+                    })
+            
+            self.logger(f"  Glossary Pruned: {len(glossary)} -> {len(new_glossary)} terms")
+            return new_glossary
         except Exception as e:
             self.logger(f"Glossary pruning failed: {e}")
             
         return glossary  # Return original if fail
 
-    def translate(self, text, source_lang='zh-CN', target_lang='en', glossary=None, system_prompt=None):
-        """Translate text using configured service"""
+    def translate(self, text, source_lang='zh-CN', target_lang='en', glossary=None, system_prompt=None, checkpoint=None):
+        """Translate text using configured service (chunks are saved to / resumed from `checkpoint`, see chunk_checkpoint.py)"""
         if not self.client:
             raise Exception("No translator available")
         
+        # Paragraphs already in the target language pass through untouched. Detection is by
+        # script, so it is skipped when source and target share one (e.g. fr -> en)
+        if system_prompt is None and target_lang and (
+            source_lang == 'auto' or language_script(source_lang) != language_script(target_lang)
+        ):
+            runs = language_runs(split_paragraphs(text), target_lang)
+            if not any(needs_translation for needs_translation, _ in runs):
+                return text
+            if len(runs) > 1:
+                return join_paragraphs([
+                    self._translate_text(join_paragraphs(paras), source_lang, target_lang, glossary, checkpoint=checkpoint) if needs_translation
+                    else join_paragraphs(paras)
+                    for needs_translation, paras in runs
+                ])
+        return self._translate_text(text, source_lang, target_lang, glossary, system_prompt, checkpoint)
+
+    def _translate_text(self, text, source_lang, target_lang, glossary=None, system_prompt=None, checkpoint=None):
         # Remove internal try-except to allow catching errors in main loop
         if self.service == 'openrouter':
+            if source_lang == 'auto':
+                source_lang = detect_language(text) or source_lang  # Name the language in the prompt
+            if system_prompt is None and self.openrouter_chunk_chars:
+                return self._translate_openrouter_chunked(text, source_lang, target_lang, glossary, checkpoint)
             return self._translate_openrouter(text, source_lang, target_lang, glossary, system_prompt)
-        return self._translate_googletrans(text, source_lang, target_lang)
+        return self._translate_googletrans(text, source_lang, target_lang, checkpoint)
+
+    def translate_many(self, texts, source_lang='zh-CN', target_lang='en'):
+        """
+        Translate a list of texts, returning translations in the same order.
+        With googletrans, short single-line texts are packed one per line into
+        shared requests and the requests run in parallel.
+        """
+        if not self.client:
+            raise Exception("No translator available")
+        if self.service != 'googletrans':
+            return [self.translate(text, source_lang, target_lang) for text in texts]
+        
+        max_length = 4500
+        results = list(texts)
+        batches = []
+        current, current_length = [], 0
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            if '\n' in text or len(text) > max_length:
+                batches.append([i])  # Translated on its own (chunked if needed)
+                continue
+            if current and current_length + len(text) + 1 > max_length:
+                batches.append(current)
+                current, current_length = [], 0
+            current.append(i)
+            current_length += len(text) + 1
+        if current:
+            batches.append(current)
+        
+        def translate_batch(batch):
+            if len(batch) == 1:
+                return [self._translate_googletrans(texts[batch[0]], source_lang, target_lang)]
+            source = source_lang.replace('zh-CN', 'zh-cn')
+            lines = self._googletrans_call('\n'.join(texts[i] for i in batch), source, target_lang).split('\n')
+            if len(lines) == len(batch):
+                return [line.strip() for line in lines]
+            # Line structure not preserved - translate this batch's texts individually
+            return [self._googletrans_call(texts[i], source, target_lang) for i in batch]
+        
+        for batch, translated in zip(batches, self._parallel_map(translate_batch, batches)):
+            for i, text in zip(batch, translated):
+                results[i] = text
+        return results
+
+    def translate_titles(self, titles, source_lang='zh-CN', target_lang='en', glossary=None, batch_size=50):
+        """
+        Translate many chapter titles with few requests, returning translations in order.
+        OpenRouter gets a numbered list per batch; titles missing from the reply are
+        translated individually.
+        """
+        if self.service != 'openrouter':
+            return self.translate_many(titles, source_lang, target_lang)
+        
+        prompt = f"""You are an expert webnovel translator. Translate each numbered {source_lang} chapter title to {target_lang}.
+Rules:
+1. Keep the numbering: output exactly one line per title, formatted as "<number>. <translation>".
+2. Use Standard Title Case and keep chapter numbering in the title (e.g. "Chapter 12: ...").
+3. Do not add notes or explanations."""
+        
+        results = []
+        for start in range(0, len(titles), batch_size):
+            batch = titles[start:start + batch_size]
+            numbered = '\n'.join(f"{i}. {title}" for i, title in enumerate(batch, 1))
+            # Only the glossary terms that occur in this batch
+            batch_glossary = [item for item in glossary or [] if item.get('original') and item['original'] in numbered]
+            
+            translated = {}
+            try:
+                reply = self.translate(numbered, source_lang, target_lang, glossary=batch_glossary, system_prompt=prompt)
+                for line in reply.split('\n'):
+                    match = re.match(r'\s*(\d+)[.)、:]\s*(.+)', line)
+                    if match:
+                        translated[int(match.group(1))] = match.group(2).strip()
+            except Exception as e:
+                self.logger(f"  Bulk title translation failed ({e}), translating titles individually")
+            
+            for i, title in enumerate(batch, 1):
+                if i not in translated:
+                    translated[i] = self.translate(title, source_lang, target_lang, glossary=batch_glossary)
+                results.append(translated[i])
+        return results
 
     def translate_title(self, text, source='zh-CN', target='en'):
         """Specialized translation for story titles"""
@@ -272,53 +352,115 @@ Output strictly valid JSON with this format:
 }}
 """
         
-        headers = {
-            "Authorization": f"Bearer {self.openrouter_api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/your-repo-link", 
-            "X-Title": "NovelCrawler" 
-        }
-        
-        data = {
-            "model": self.openrouter_model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
-        }
-        
         try:
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                data=json.dumps(data),
-                timeout=60
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'choices' in result and len(result['choices']) > 0:
-                    content = result['choices'][0]['message']['content'].strip()
-                    # Clean markdown
-                    if "```json" in content:
-                        content = content.split("```json")[1].split("```")[0].strip()
-                    elif "```" in content:
-                        content = content.split("```")[1].split("```")[0].strip()
-                        
-                    return json.loads(content)
+            result = self._post_openrouter([{"role": "user", "content": prompt}], kind='metadata')
+            content = result['choices'][0]['message']['content'].strip()
+            # Clean markdown
+            if "```json" in content:
+                content = content.split("```json")[1].split("```")[0].strip()
+            elif "```" in content:
+                content = content.split("```")[1].split("```")[0].strip()
+                
+            return json.loads(content)
         except Exception as e:
             self.logger(f"Metadata generation failed: {e}")
             
         return {'genres': [], 'tags': []}
 
-    def _translate_openrouter(self, text, source, target, glossary=None, system_prompt=None):
-        """Translate using OpenRouter API"""
-        headers = {
-            "Authorization": f"Bearer {self.openrouter_api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/your-repo-link", # Optional
-            "X-Title": "NovelCrawler" # Optional
-        }
+    def _translate_openrouter_chunked(self, text, source, target, glossary=None, checkpoint=None):
+        """
+        Translate chapter text in paragraph chunks of at most openrouter_chunk_chars.
+        Each chunk is checked on return, so a bad reply costs only the failing
+        paragraphs or the truncated tail instead of the whole chapter.
+        """
+        paragraphs = split_paragraphs(text)
+        if not paragraphs:
+            return text
+        
+        chunks = chunk_paragraphs(paragraphs, self.openrouter_chunk_chars)
+        self.telemetry.record_chunks(len(chunks))
+        translated = []
+        for i, chunk in enumerate(chunks):
+            chunk_text = join_paragraphs(chunk)
+            done = checkpoint.get(i, chunk_text) if checkpoint is not None else None
+            if done is not None:
+                self.telemetry.record_cache_hit()
+                translated.extend(done)
+                continue
+            done = self._translate_openrouter_chunk(chunk, source, target, glossary)
+            if checkpoint is not None:
+                checkpoint.put(i, chunk_text, done)
+            translated.extend(done)
+        return join_paragraphs(translated)
+
+    @staticmethod
+    def _aligned(sources, outputs, tolerance=2.5):
+        """
+        Heuristic check that outputs[i] is the translation of sources[i]: same count and
+        no paragraph whose length ratio is far off the others (a sign of merged paragraphs)
+        """
+        if len(sources) != len(outputs):
+            return False
+        ratios = [len(out) / len(src) for src, out in zip(sources, outputs) if len(src) >= 20 or len(out) >= 20]
+        if len(ratios) < 2:
+            return True
+        median = sorted(ratios)[len(ratios) // 2]
+        return all(median / tolerance <= ratio <= median * tolerance for ratio in ratios)
+
+    def _translate_openrouter_chunk(self, paragraphs, source, target, glossary=None, depth=0):
+        """Translate one chunk of paragraphs; returns the translated paragraphs"""
+        output, finish_reason = self._translate_openrouter(
+            join_paragraphs(paragraphs), source, target, glossary, with_finish_reason=True
+        )
+        result = split_paragraphs(output)
+        truncated = finish_reason == 'length'
+        
+        if truncated and depth < 3:
+            # Truncated reply: keep the complete paragraphs (the last one is cut off), but only
+            # if they line up with the source - a merged paragraph would shift the tail
+            kept = result[:-1]
+            tail = paragraphs[len(kept):]
+            if kept and tail and self._aligned(paragraphs[:len(kept)], kept):
+                self.logger(f"  Translation truncated - translating the last {len(tail)} paragraphs again")
+                result = kept + self._translate_openrouter_chunk(tail, source, target, glossary, depth + 1)
+            elif len(paragraphs) > 1:
+                half = len(paragraphs) // 2
+                self.logger(f"  Translation truncated - splitting chunk of {len(paragraphs)} paragraphs")
+                result = (self._translate_openrouter_chunk(paragraphs[:half], source, target, glossary, depth + 1)
+                          + self._translate_openrouter_chunk(paragraphs[half:], source, target, glossary, depth + 1))
+        
+        if depth > 0 or is_cjk_language(target):
+            return result  # Residue is checked once, on the reassembled chunk
         
+        # Untranslated residue: leftover CJK in the output
+        if len(result) == len(paragraphs):
+            failing = [i for i, para in enumerate(result) if cjk_ratio(para) > self.residue_threshold]
+            if len(failing) > 1 and len(failing) * 2 > len(paragraphs):
+                # Mostly echoed back: one more try for the whole chunk
+                self.logger("  Chunk left largely untranslated - translating it again")
+                retry = split_paragraphs(self._translate_openrouter(join_paragraphs(paragraphs), source, target, glossary))
+                if len(retry) != len(paragraphs):
+                    return retry if cjk_ratio(join_paragraphs(retry)) < cjk_ratio(join_paragraphs(result)) else result
+                result = retry
+                failing = [i for i, para in enumerate(result) if cjk_ratio(para) > self.residue_threshold]
+            if failing:
+                self.logger(f"  {len(failing)} paragraph(s) left untranslated - translating them again")
+                retried = [paragraphs[i] for i in failing]
+                combined = self._translate_openrouter(join_paragraphs(retried), source, target, glossary)
+                translations = split_paragraphs(combined) if len(failing) > 1 else [combined]
+                if len(translations) != len(failing):
+                    # Paragraphs merged/split in the combined reply - no safe mapping, go one by one
+                    translations = [self._translate_openrouter(para, source, target, glossary) for para in retried]
+                for i, translation in zip(failing, translations):
+                    result[i] = translation
+        elif not truncated and cjk_ratio(join_paragraphs(result)) > self.residue_threshold:
+            self.logger("  Chunk left largely untranslated - translating it again")
+            output = self._translate_openrouter(join_paragraphs(paragraphs), source, target, glossary)
+            result = split_paragraphs(output)
+        return result
+
+    def _translate_openrouter(self, text, source, target, glossary=None, system_prompt=None, with_finish_reason=False):
+        """Translate using OpenRouter API (optionally returning (text, finish_reason))"""
         if system_prompt:
             prompt = system_prompt
         else:
@@ -328,89 +470,161 @@ Output strictly valid JSON with this format:
             glossary_str = json.dumps(glossary, ensure_ascii=False, indent=2)
             prompt += f"\n\nReference this glossary for consistent translation:\n{glossary_str}"
         
-        data = {
-            "model": self.openrouter_model,
-            "messages": [
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": text}
-            ]
+        result = self._post_openrouter([
+            {"role": "system", "content": prompt},
+            {"role": "user", "content": text}
+        ], kind='translate')
+        content = result['choices'][0]['message']['content'].strip()
+        if with_finish_reason:
+            return content, result['choices'][0].get('finish_reason')
+        return content
+
+    def _post_openrouter(self, messages, timeout=60, max_attempts=3, kind='translate'):
+        """
+        POST a chat completion and return the response JSON. Every OpenRouter call goes
+        through here: the router picks the best healthy model from the pool and a
+        failing, slow or rate-limited model fails over to the next one. Each call is
+        recorded in the telemetry under `kind` with its usage, latency and retries.
+        """
+        headers = {
+            "Authorization": f"Bearer {self.openrouter_api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/your-repo-link", # Optional
+            "X-Title": "NovelCrawler" # Optional
         }
         
-        # Retry logic for API calls
-        max_retries = 3
-        for attempt in range(max_retries):
+        attempts = max(max_attempts, len(self.router.models))
+        estimated_tokens = estimate_request_tokens(messages)
+        last_error = None
+        for attempt in range(attempts):
+            model = self.router.candidates(preferred=self.openrouter_model)[0]
+            wait_time = self.router.wait_time(model)
+            if wait_time:
+                # Every model is cooling down - wait for the first one (bounded like the old 429 backoff)
+                wait_time = min(wait_time, 5 * (attempt + 1))
+                self.logger(f"Rate limited by OpenRouter. Waiting {wait_time:.0f}s...")
+                time.sleep(wait_time)
+            
+            # usage.include: OpenRouter reports the cost of the request alongside the token counts
+            data = {"model": model, "messages": messages, "usage": {"include": True}}
+            budget_entry = self.budget.acquire(estimated_tokens)
+            start = time.time()
             try:
-                response = requests.post(
+                response = (self.mock.post if self.mock else requests.post)(
                     "https://openrouter.ai/api/v1/chat/completions",
                     headers=headers,
                     data=json.dumps(data),
-                    timeout=60
+                    timeout=timeout
                 )
-                
-                if response.status_code == 200:
+            except requests.RequestException as e:
+                response = None
+                last_error = e
+            latency = time.time() - start
+            
+            if response is None:
+                self.router.record(model, latency, 'error')
+            elif response.status_code == 200:
+                try:
                     result = response.json()
-                    if 'choices' in result and len(result['choices']) > 0:
-                        return result['choices'][0]['message']['content'].strip()
-                    else:
-                        raise Exception(f"Invalid response from OpenRouter: {result}")
-                elif response.status_code == 401:
-                    self.logger(f"CRITICAL ERROR: OpenRouter Authorization Failed (401).")
-                    self.logger(f"  - Check your OPENROUTER_API_KEY in GitHub Secrets.")
-                    self.logger(f"  - Response: {response.text}")
-                    # Do not retry auth errors
-                    raise Exception(f"OpenRouter Auth Error: {response.text}")
-                elif response.status_code == 429:
-                    # Rate limit
-                    wait_time = 5 * (attempt + 1)
-                    self.logger(f"Rate limited by OpenRouter. Waiting {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise Exception(f"OpenRouter API error: {response.status_code} - {response.text}")
-                    
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise e
-                self.logger(f"OpenRouter request failed (attempt {attempt+1}): {e}")
+                except ValueError as e:
+                    # Non-JSON or truncated body: a failure of this model, like a 5xx
+                    result = None
+                    last_error = Exception(f"Unreadable response from OpenRouter ({e}): {response.text[:200]}")
+                if isinstance(result, dict) and result.get('choices'):
+                    self.router.record(model, latency, 'ok')
+                    usage = result.get('usage') or {}
+                    if usage.get('total_tokens'):
+                        self.budget.settle(budget_entry, usage['total_tokens'])
+                    self.telemetry.record_call(kind, model, usage, latency, retries=attempt)
+                    served = getattr(self._local, 'models_used', None)
+                    if served is not None:
+                        served.add(result.get('model') or model)
+                    return result
+                self.router.record(model, latency, 'error')
+                if result is not None:
+                    last_error = Exception(f"Invalid response from OpenRouter: {result}")
+            elif response.status_code == 401:
+                self.logger(f"CRITICAL ERROR: OpenRouter Authorization Failed (401).")
+                self.logger(f"  - Check your OPENROUTER_API_KEY in GitHub Secrets.")
+                self.logger(f"  - Response: {response.text}")
+                self.telemetry.record_call(kind, model, latency=latency, retries=attempt, status='auth_error')
+                # Do not retry auth errors
+                raise Exception(f"OpenRouter Auth Error: {response.text}")
+            elif response.status_code == 429:
+                self.router.record(model, latency, 'rate_limited')
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    self.budget.pause(int(retry_after))
+                last_error = Exception(f"OpenRouter rate limit on {model}")
+            else:
+                self.router.record(model, latency, 'error')
+                last_error = Exception(f"OpenRouter API error: {response.status_code} - {response.text}")
+            
+            if len(self.router.models) > 1:
+                self.logger(f"  {model} failed ({last_error}) - failing over")
+            elif response is None or response.status_code != 429:
+                self.logger(f"OpenRouter request failed (attempt {attempt+1}): {last_error}")
                 time.sleep(2)
         
-        return text
+        self.telemetry.record_call(kind, model, latency=latency, retries=attempts - 1, status='error')
+        raise last_error
 
-    def _translate_googletrans(self, text, source, target):
-        """Translate using googletrans with chunking for long texts"""
+    def track_models(self):
+        """Collect the models that actually serve this thread's requests from now on (after failover); returns the set"""
+        self._local.models_used = set()
+        return self._local.models_used
+
+    def _parallel_map(self, func, items):
+        """Order-preserving map over a bounded worker pool"""
+        if len(items) <= 1 or self.googletrans_workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.googletrans_workers, len(items))) as executor:
+            return list(executor.map(self.telemetry.bind(func), items))
+
+    def _googletrans_call(self, text, source, target):
+        """Translate one chunk with this thread's googletrans client, retrying failures"""
+        for attempt in range(self.googletrans_retries):
+            start = time.time()
+            try:
+                client = getattr(self._local, 'client', None)
+                if client is None:
+                    client = self._local.client = GoogletransTranslator()
+                translated = client.translate(text, src=source, dest=target).text
+                self.telemetry.record_call('googletrans', latency=time.time() - start, retries=attempt)
+                return translated
+            except Exception as e:
+                if attempt == self.googletrans_retries - 1:
+                    self.telemetry.record_call('googletrans', latency=time.time() - start, retries=attempt, status='error')
+                    raise
+                self._local.client = None  # Fresh client (and token) for the retry
+                self.logger(f"  googletrans chunk failed ({type(e).__name__}: {e}), retrying...")
+                time.sleep(2 ** attempt)
+
+    def _translate_googletrans(self, text, source, target, checkpoint=None):
+        """Translate using googletrans; long texts are chunked and the chunks translated in parallel"""
         max_length = 4500  # Under 5000 limit
         
         # Map language codes
         source = source.replace('zh-CN', 'zh-cn')
         
         if len(text) <= max_length:
-            result = self.client.translate(text, src=source, dest=target)
-            return result.text
-        else:
-            # Split by paragraphs and group into chunks
-            paragraphs = text.split('\n\n')
-            translated_paragraphs = []
-            current_chunk = []
-            current_length = 0
-            
-            for para in paragraphs:
-                if current_length + len(para) > max_length and current_chunk:
-                    # Translate current chunk
-                    chunk_text = '\n\n'.join(current_chunk)
-                    result = self.client.translate(chunk_text, src=source, dest=target)
-                    translated_paragraphs.append(result.text)
-                    
-                    # Start new chunk
-                    current_chunk = [para]
-                    current_length = len(para)
-                else:
-                    current_chunk.append(para)
-                    current_length += len(para)
-            
-            # Translate remaining chunk
-            if current_chunk:
-                chunk_text = '\n\n'.join(current_chunk)
-                result = self.client.translate(chunk_text, src=source, dest=target)
-                translated_paragraphs.append(result.text)
-            
-            return '\n\n'.join(translated_paragraphs)
+            self.telemetry.record_chunks(1)
+            return self._googletrans_call(text, source, target)
+        
+        # Split by paragraphs and group into chunks
+        chunks = [join_paragraphs(chunk) for chunk in chunk_paragraphs(text.split('\n\n'), max_length)]
+        self.telemetry.record_chunks(len(chunks))
+        
+        def translate_chunk(item):
+            i, chunk = item
+            done = checkpoint.get(i, chunk) if checkpoint is not None else None
+            if done is not None:
+                self.telemetry.record_cache_hit()
+                return done[0]
+            translated = self._googletrans_call(chunk, source, target)
+            if checkpoint is not None:
+                checkpoint.put(i, chunk, [translated])
+            return translated
+        
+        translated_chunks = self._parallel_map(translate_chunk, list(enumerate(chunks)))
+        return '\n\n'.join(translated_chunks)